@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from elephantbox.analysis.Findings import Finding
+from elephantbox.analysis.Outlines import polyline
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Point
+
+
+def contour_edges(
+    contours: Sequence[Contour], tolerance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Every contour as straight edges: an (n, 2, 2) array and their owners."""
+    edges, owners = [], []
+    for index, contour in enumerate(contours):
+        points = np.array([p.tuple for p in polyline(contour, tolerance)])
+        if len(points) < 2:
+            points = np.array([contour.start.tuple, contour.end.tuple])
+        edges.append(np.stack([points[:-1], points[1:]], axis=1))
+        owners.append(np.full(len(points) - 1, index))
+    if not edges:
+        return np.empty((0, 2, 2)), np.empty(0, dtype=int)
+    return np.concatenate(edges), np.concatenate(owners)
+
+
+def candidate_pairs(
+    edges: np.ndarray, owners: np.ndarray, reach: float
+) -> np.ndarray:
+    """Edge pairs of different contours that may lie within `reach`.
+
+    Edges are cut into pieces no longer than a grid cell of side `reach`
+    and each piece is filed under every cell its bounds, grown by `reach`,
+    overlap. Edges closer than `reach` then always share a cell, and only
+    edges sharing a cell are paired.
+    """
+    lengths = np.hypot(*(edges[:, 1] - edges[:, 0]).T)
+    splits = np.maximum(np.ceil(lengths / reach), 1).astype(int)
+    edge = np.repeat(np.arange(len(edges)), splits)
+    first = np.cumsum(splits) - splits
+    t0 = (np.arange(len(edge)) - first[edge]) / splits[edge]
+    t1 = t0 + 1 / splits[edge]
+    a, b = edges[edge, 0], edges[edge, 1]
+    p = a + (b - a) * t0[:, np.newaxis]
+    q = a + (b - a) * t1[:, np.newaxis]
+
+    low = np.floor((np.minimum(p, q) - reach) / reach).astype(np.int64)
+    high = np.floor((np.maximum(p, q) + reach) / reach).astype(np.int64)
+    keys, members = [], []
+    # a grown piece spans three cells at most, so four per axis when unaligned
+    for dx in range(4):
+        for dy in range(4):
+            cell = low + (dx, dy)
+            inside = (cell[:, 0] <= high[:, 0]) & (cell[:, 1] <= high[:, 1])
+            keys.append(cell[inside])
+            members.append(edge[inside])
+    keys = np.concatenate(keys)
+    keys -= keys.min(axis=0)
+    cells = keys[:, 0] * (int(keys[:, 1].max()) + 1) + keys[:, 1]
+    # one entry per edge and cell, sorted by cell and then by edge
+    entries = np.unique(cells * len(edges) + np.concatenate(members))
+    cells, members = entries // len(edges), entries % len(edges)
+
+    # cells holding a single contour cannot pair anything
+    starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+    sizes = np.diff(np.r_[starts, len(cells)])
+    mixed = np.minimum.reduceat(owners[members], starts) != (
+        np.maximum.reduceat(owners[members], starts)
+    )
+    keep = np.repeat(mixed, sizes)
+    cells, members = cells[keep], members[keep]
+
+    # pair each entry with the one `k` places on while both share a cell
+    found = [np.empty((0, 2), dtype=int)]
+    k = 1
+    while True:
+        shared = np.flatnonzero(cells[k:] == cells[:-k])
+        if not len(shared):
+            break
+        i, j = members[shared], members[shared + k]
+        apart = owners[i] != owners[j]
+        found.append(np.stack([i[apart], j[apart]], axis=1))
+        k += 1
+    return np.unique(np.concatenate(found), axis=0)
+
+
+def closest_points(
+    first: np.ndarray, second: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Distance between each pair of edges and the points that realise it.
+
+    Edges that cross are zero apart.
+    """
+
+    def onto(points: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        a, b = edges[:, 0], edges[:, 1]
+        d = b - a
+        norm = np.maximum(np.einsum("ij,ij->i", d, d), 1e-300)
+        t = np.einsum("ij,ij->i", points - a, d) / norm
+        return a + d * np.clip(t, 0, 1)[:, np.newaxis]
+
+    candidates = [
+        (first[:, 0], onto(first[:, 0], second)),
+        (first[:, 1], onto(first[:, 1], second)),
+        (onto(second[:, 0], first), second[:, 0]),
+        (onto(second[:, 1], first), second[:, 1]),
+    ]
+    froms = np.stack([c[0] for c in candidates])
+    tos = np.stack([c[1] for c in candidates])
+    distances = np.hypot(*(tos - froms).transpose(2, 0, 1))
+    best = np.argmin(distances, axis=0)
+    index = np.arange(len(best))
+
+    a, b = first[:, 0], first[:, 1]
+    c, d = second[:, 0], second[:, 1]
+
+    def side(p, q, r):
+        return (q[:, 0] - p[:, 0]) * (r[:, 1] - p[:, 1]) - (
+            q[:, 1] - p[:, 1]
+        ) * (r[:, 0] - p[:, 0])
+
+    crossed = (side(a, b, c) * side(a, b, d) < 0) & (
+        side(c, d, a) * side(c, d, b) < 0
+    )
+    distance = np.where(crossed, 0.0, distances[best, index])
+    return distance, froms[best, index], tos[best, index]
+
+
+def check_clearance(
+    contours: Sequence[Contour],
+    min_web: float,
+    tolerance: float = 1e-3,
+) -> list[Finding]:
+    """Pairs of features that leave less than `min_web` of stock between them.
+
+    Features that touch or cross, such as folds running into the outline
+    or the pieces of one outline, are joined rather than close, and are
+    never reported.
+    """
+    if min_web <= 0 or len(contours) < 2:
+        return []
+    # arcs need no finer chords than the web is measured to
+    tolerance = max(tolerance, min_web / 100)
+    edges, owners = contour_edges(contours, tolerance)
+    pairs = candidate_pairs(edges, owners, min_web)
+    if not len(pairs):
+        return []
+
+    distance, p, q = closest_points(edges[pairs[:, 0]], edges[pairs[:, 1]])
+    first, second = owners[pairs[:, 0]], owners[pairs[:, 1]]
+    order = np.lexsort((distance, second, first))
+    features = np.stack([first, second], axis=1)[order]
+    starts = np.flatnonzero(
+        np.r_[True, np.any(np.diff(features, axis=0) != 0, axis=1)]
+    )
+
+    findings = []
+    for start in starts.tolist():
+        closest = order[start]
+        gap = float(distance[closest])
+        if gap <= tolerance or min_web <= gap:
+            continue
+        i, j = features[start].tolist()
+        x, y = ((p[closest] + q[closest]) / 2).tolist()
+        findings.append(
+            Finding(
+                "clearance",
+                f"{contours[i].layer} and {contours[j].layer} leave a web of",
+                Point(x, y),
+                gap,
+            )
+        )
+    return findings
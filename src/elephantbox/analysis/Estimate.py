@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from math import cos
+from math import hypot
+from math import sin
+from math import sqrt
+
+import numpy as np
+
+from elephantbox.export.GCode import DEFAULT_LAYER_SETTINGS
+from elephantbox.export.GCode import LayerSettings
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Arc
+from elephantbox.math.Geometry import Point
+
+
+@dataclass(frozen=True)
+class Machine:
+    """Motion limits of the laser: mm/s², mm/min and seconds per pierce.
+
+    `junction_deviation` (mm) sets how fast corners are taken, as in GRBL.
+    """
+
+    acceleration: float = 1000
+    rapid_feed: float = 6000
+    pierce_time: float = 0.05
+    junction_deviation: float = 0.01
+
+
+@dataclass(frozen=True)
+class LayerEstimate:
+    layer: str
+    length: float
+    pierces: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class JobEstimate:
+    layers: tuple[LayerEstimate, ...]
+    travel: float
+    travel_seconds: float
+
+    @property
+    def seconds(self) -> float:
+        return self.travel_seconds + sum(e.seconds for e in self.layers)
+
+    def report(self) -> str:
+        lines = [
+            f"{e.layer}: {e.length:.1f} mm, {e.pierces} pierces,"
+            f" {e.seconds:.1f} s"
+            for e in self.layers
+        ]
+        lines.append(
+            f"travel: {self.travel:.1f} mm, {self.travel_seconds:.1f} s"
+        )
+        lines.append(f"total: {self.seconds:.1f} s")
+        return "\n".join(lines)
+
+
+def primitive_lengths(
+    contours: Sequence[Contour],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Exact length of every primitive, with the index of its contour."""
+    owners, chords, arcs = [], [], []
+    for index, contour in enumerate(contours):
+        for p in contour.primitives:
+            owners.append(index)
+            if isinstance(p, Arc):
+                chords.append((0, 0, 0, 0))
+                arcs.append((p.radius, p.sweep))
+            else:
+                chords.append((*p.start.tuple, *p.end.tuple))
+                arcs.append((0, 0))
+    if not owners:
+        return np.zeros(0, dtype=int), np.zeros(0)
+
+    chords_array = np.array(chords)
+    arcs_array = np.array(arcs)
+    lengths = np.hypot(
+        chords_array[:, 2] - chords_array[:, 0],
+        chords_array[:, 3] - chords_array[:, 1],
+    ) + np.abs(arcs_array[:, 0] * arcs_array[:, 1])
+    return np.array(owners), lengths
+
+
+def contour_lengths(contours: Sequence[Contour]) -> np.ndarray:
+    """Exact length of every contour, summed from flat primitive arrays."""
+    owners, lengths = primitive_lengths(contours)
+    return np.bincount(owners, weights=lengths, minlength=len(contours))
+
+
+def primitive_tangents(
+    contours: Sequence[Contour],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Unit tangents where every primitive starts and ends, and arc radii.
+
+    Segments get a radius of zero, and a point-like primitive no tangent.
+    """
+    starts, ends, radii = [], [], []
+    for contour in contours:
+        for p in contour.primitives:
+            if isinstance(p, Arc):
+                turn = np.sign(p.sweep)
+                starts.append(
+                    (-turn * sin(p.start_angle), turn * cos(p.start_angle))
+                )
+                ends.append((-turn * sin(p.end_angle), turn * cos(p.end_angle)))
+                radii.append(p.radius)
+            else:
+                delta = p.end - p.start
+                length = hypot(delta.x, delta.y)
+                unit = (
+                    (delta.x / length, delta.y / length) if length else (0, 0)
+                )
+                starts.append(unit)
+                ends.append(unit)
+                radii.append(0)
+    if not radii:
+        return np.zeros((0, 2)), np.zeros((0, 2)), np.zeros(0)
+    return np.array(starts), np.array(ends), np.array(radii)
+
+
+def corner_speeds(
+    outs: np.ndarray, ins: np.ndarray, machine: Machine
+) -> np.ndarray:
+    """Fastest speed (mm/s) through each turn from `outs` into `ins`.
+
+    Junction deviation: a turn is taken as fast as a circle `deviation`
+    inside the corner allows, so a straight join has no limit and a
+    reversal comes to a stop.
+    """
+    cos_turn = -np.sum(outs * ins, axis=1)
+    sin_half = np.sqrt(np.clip(0.5 * (1 - cos_turn), 0, 1))
+    with np.errstate(divide="ignore"):
+        return np.sqrt(
+            machine.acceleration
+            * machine.junction_deviation
+            * sin_half
+            / (1 - sin_half)
+        )
+
+
+def move_seconds(
+    lengths: np.ndarray,
+    feed: float | np.ndarray,
+    acceleration: float,
+    entry: float | np.ndarray = 0,
+    exit: float | np.ndarray = 0,
+) -> np.ndarray:
+    """Time for each move under a trapezoidal speed profile.
+
+    Moves start at `entry` and end at `exit` (mm/s), which must be within
+    reach of each other; moves too short to reach `feed` (mm/min)
+    accelerate and brake without cruising.
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    ends = np.square(entry) + np.square(exit)
+    peak = np.minimum(
+        np.asarray(feed) / 60, np.sqrt(acceleration * lengths + ends / 2)
+    )
+    ramps = (2 * peak * peak - ends) / (2 * acceleration)
+    cruise = np.divide(
+        lengths - ramps,
+        peak,
+        out=np.zeros(np.broadcast(lengths, peak).shape),
+        where=0 < peak,
+    )
+    return (2 * peak - entry - exit) / acceleration + cruise
+
+
+def cut_seconds(
+    contours: Sequence[Contour],
+    feeds: np.ndarray,
+    machine: Machine,
+    mm_per_unit: float = 1,
+) -> np.ndarray:
+    """Time to cut each contour once, primitive by primitive.
+
+    Every contour starts and ends at rest. Between its primitives the speed
+    is held to the corner limit, arcs to the speed their radius allows, and
+    every speed to what the acceleration can reach from either side.
+    """
+    owners, lengths = primitive_lengths(contours)
+    if not len(owners):
+        return np.zeros(len(contours))
+    lengths = lengths * mm_per_unit
+    starts, ends, radii = primitive_tangents(contours)
+    # point-like primitives carry on in the direction before them
+    still = ~np.any(ends, axis=1)
+    before = ends[
+        np.maximum.accumulate(np.where(still, 0, np.arange(len(owners))))
+    ]
+    starts = np.where(still[:, np.newaxis], before, starts)
+    ends = np.where(still[:, np.newaxis], before, ends)
+    a = machine.acceleration
+    cruise = feeds[owners] / 60
+    bends = 0 < radii
+    cruise[bends] = np.minimum(
+        cruise[bends], np.sqrt(a * radii[bends] * mm_per_unit)
+    )
+
+    # the speed at the far end of each primitive, zero where a contour ends
+    joined = np.r_[owners[1:] == owners[:-1], False]
+    exits = np.zeros(len(owners))
+    limits = np.minimum(
+        corner_speeds(ends[:-1], starts[1:], machine),
+        np.minimum(cruise[:-1], cruise[1:]),
+    )
+    exits[:-1] = np.where(joined[:-1], limits, 0)
+
+    exit_list, lengths_list = exits.tolist(), lengths.tolist()
+    entry = 0.0
+    for k, length in enumerate(lengths_list):
+        exit_list[k] = min(exit_list[k], sqrt(entry * entry + 2 * a * length))
+        entry = exit_list[k] if joined[k] else 0.0
+    for k in range(len(lengths_list) - 2, -1, -1):
+        if joined[k]:
+            reach = exit_list[k + 1] ** 2 + 2 * a * lengths_list[k + 1]
+            exit_list[k] = min(exit_list[k], sqrt(reach))
+    exits = np.array(exit_list)
+    entries = np.r_[0, np.where(joined[:-1], exits[:-1], 0)]
+
+    seconds = move_seconds(lengths, cruise * 60, a, entries, exits)
+    return np.bincount(owners, weights=seconds, minlength=len(contours))
+
+
+def estimate(
+    contours: Sequence[Contour],
+    settings: dict[str, LayerSettings] = DEFAULT_LAYER_SETTINGS,
+    machine: Machine = Machine(),
+    mm_per_unit: float = 1,
+    start: Point = Point(0, 0),
+) -> JobEstimate:
+    """Cut length, pierces and time per layer, for the contours in order.
+
+    Each contour is one pierce per pass, timed edge by edge with the laser
+    slowing for every corner; the rapid moves between contours are timed as
+    straight accelerated moves at the rapid feed.
+    """
+    lengths = contour_lengths(contours) * mm_per_unit
+    layer_names = np.array([c.layer for c in contours], dtype=object)
+    feeds = np.array(
+        [
+            settings.get(layer, DEFAULT_LAYER_SETTINGS["body_cut"]).feed
+            for layer in layer_names.tolist()
+        ],
+        dtype=float,
+    )
+    seconds = cut_seconds(contours, feeds, machine, mm_per_unit)
+
+    layers = []
+    for layer in dict.fromkeys(layer_names.tolist()):
+        mask = layer == layer_names
+        passes = settings.get(layer, DEFAULT_LAYER_SETTINGS["body_cut"]).passes
+        layers.append(
+            LayerEstimate(
+                layer,
+                float(passes * lengths[mask].sum()),
+                int(passes * mask.sum()),
+                float(
+                    passes
+                    * (
+                        seconds[mask].sum()
+                        + int(mask.sum()) * machine.pierce_time
+                    )
+                ),
+            )
+        )
+
+    ends = np.array([start.tuple] + [c.end.tuple for c in contours])
+    starts = np.array([c.start.tuple for c in contours]).reshape(-1, 2)
+    hops = np.hypot(*(starts - ends[:-1]).T) * mm_per_unit
+    return JobEstimate(
+        tuple(layers),
+        float(hops.sum()),
+        float(
+            move_seconds(hops, machine.rapid_feed, machine.acceleration).sum()
+        ),
+    )
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from elephantbox.analysis.Estimate import primitive_lengths
+from elephantbox.analysis.Findings import Finding
+from elephantbox.math.Contour import Contour
+
+
+def check_features(
+    contours: Sequence[Contour],
+    min_feature: float,
+    tolerance: float = 1e-3,
+) -> list[Finding]:
+    """Cuts and edges too short for the laser to make, grouped by layer.
+
+    Whole contours shorter than `min_feature`, such as dashes, only burn a
+    hole; so do the edges of a longer contour, such as zigzag teeth. Edges
+    no longer than `tolerance` are joins, not features.
+    """
+    if min_feature <= 0 or not contours:
+        return []
+    owners, lengths = primitive_lengths(contours)
+    totals = np.bincount(owners, weights=lengths, minlength=len(contours))
+    layers = np.array([c.layer for c in contours])
+
+    short_cuts = np.flatnonzero(totals < min_feature)
+    # edges of the short cuts are reported with the cut itself
+    short_edges = np.flatnonzero(
+        (tolerance < lengths)
+        & (lengths < min_feature)
+        & (min_feature <= totals[owners])
+    )
+
+    findings = []
+    for kind, found, sizes, places in (
+        ("cuts", short_cuts, totals, short_cuts),
+        ("edges", short_edges, lengths, owners[short_edges]),
+    ):
+        for layer in dict.fromkeys(layers[places].tolist()):
+            mine = found[layers[places] == layer]
+            shortest = mine[np.argmin(sizes[mine])]
+            if "cuts" == kind:
+                contour = contours[shortest]
+                location = contour.bounds.center
+            else:
+                contour = contours[owners[shortest]]
+                first = np.flatnonzero(owners == owners[shortest])[0]
+                primitive = contour.primitives[shortest - first]
+                location = primitive.point_at(0.5)
+            findings.append(
+                Finding(
+                    "feature",
+                    f"{len(mine)} {layer} {kind} under the minimum,"
+                    " the shortest",
+                    location,
+                    float(sizes[shortest]),
+                )
+            )
+    return findings
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from elephantbox.math.Geometry import Point
+
+
+@dataclass(frozen=True)
+class Finding:
+    """One geometric problem, measured in drawing units.
+
+    `size`, when given, is the length the message ends by describing.
+    """
+
+    check: str
+    message: str
+    location: Point | None = None
+    size: float | None = None
+
+    def describe(self, dpi: float = 1) -> str:
+        text = f"{self.check}: {self.message}"
+        if self.size is not None:
+            text += f" {self.size / dpi:.4g}"
+        if self.location is not None:
+            x, y = self.location.x / dpi, self.location.y / dpi
+            text += f" at ({x:.3f}, {y:.3f})"
+        return text
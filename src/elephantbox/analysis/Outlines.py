@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from math import acos
+from math import ceil
+from math import hypot
+
+import numpy as np
+
+from elephantbox.analysis.Findings import Finding
+from elephantbox.boxes.component.Defaults import OUTLINE_LAYERS
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Arc
+from elephantbox.math.Geometry import Point
+
+
+# edges screened against every other edge in one array operation
+BLOCK = 256
+
+
+def polyline(contour: Contour, tolerance: float) -> list[Point]:
+    """Vertices of the contour with arcs flattened to `tolerance`.
+
+    Vertices closer than `tolerance` to the previous one are dropped, so
+    slivers do not read as crossings.
+    """
+    points = [contour.start]
+    for primitive in contour.primitives:
+        if isinstance(primitive, Arc) and tolerance < primitive.radius:
+            step = 2 * acos(1 - tolerance / primitive.radius)
+            count = ceil(abs(primitive.sweep) / step)
+            more = [primitive.point_at(i / count) for i in range(1, count + 1)]
+        else:
+            more = [primitive.end]
+        for p in more:
+            if tolerance < (p - points[-1]).length:
+                points.append(p)
+    return points
+
+
+def chain_outlines(
+    contours: Sequence[Contour], tolerance: float
+) -> list[list[Point]]:
+    """Join outline pieces end to end into as few polylines as possible."""
+    pieces = [polyline(c, tolerance) for c in contours]
+    chains = []
+    while pieces:
+        chain = pieces.pop(0)
+        joined = True
+        while joined and tolerance < (chain[-1] - chain[0]).length:
+            joined = False
+            for index, piece in enumerate(pieces):
+                if (piece[0] - chain[-1]).length <= tolerance:
+                    chain += piece[1:]
+                elif (piece[-1] - chain[-1]).length <= tolerance:
+                    chain += piece[-2::-1]
+                else:
+                    continue
+                pieces.pop(index)
+                joined = True
+                break
+        chains.append(chain)
+    return chains
+
+
+def orientation(a: Point, b: Point, c: Point, tolerance: float) -> int:
+    cross = (b.x - a.x) * (c.y - a.y) - (b.y - a.y) * (c.x - a.x)
+    if abs(cross) <= tolerance * hypot(b.x - a.x, b.y - a.y):
+        return 0
+    return 1 if 0 < cross else -1
+
+
+def crossing(
+    p: Point, q: Point, r: Point, s: Point, tolerance: float
+) -> Point | None:
+    """Where segments pq and rs meet, if they do."""
+    o1, o2 = orientation(p, q, r, tolerance), orientation(p, q, s, tolerance)
+    o3, o4 = orientation(r, s, p, tolerance), orientation(r, s, q, tolerance)
+    if o1 * o2 < 0 and o3 * o4 < 0:
+        d = (q.x - p.x) * (s.y - r.y) - (q.y - p.y) * (s.x - r.x)
+        t = ((r.x - p.x) * (s.y - r.y) - (r.y - p.y) * (s.x - r.x)) / d
+        return p + (q - p) * t
+
+    def within(a: Point, b: Point, c: Point) -> bool:
+        return (
+            min(a.x, b.x) - tolerance <= c.x <= max(a.x, b.x) + tolerance
+            and min(a.y, b.y) - tolerance <= c.y <= max(a.y, b.y) + tolerance
+        )
+
+    for o, a, b, c in (
+        (o1, p, q, r),
+        (o2, p, q, s),
+        (o3, r, s, p),
+        (o4, r, s, q),
+    ):
+        if 0 == o and within(a, b, c):
+            return c
+    return None
+
+
+def first_crossing(
+    points: list[Point], closed: bool, tolerance: float
+) -> Point | None:
+    """A point where the polyline meets itself, if any.
+
+    Every pair of edges is screened at once by their bounds, grown by
+    `tolerance`, in blocks of `BLOCK` rows; only pairs whose bounds overlap
+    are tested exactly. Edges sharing a vertex are neighbours along the
+    polyline and never count as crossing.
+    """
+    count = len(points) - 1
+    if count < 3:
+        return None
+
+    ends = np.array([p.tuple for p in points])
+    low = np.minimum(ends[:-1], ends[1:]) - tolerance
+    high = np.maximum(ends[:-1], ends[1:]) + tolerance
+    later = np.arange(count)
+    for first in range(0, count, BLOCK):
+        rows = slice(first, min(first + BLOCK, count))
+        i = later[rows, np.newaxis]
+        overlap = np.all(
+            (low[rows, np.newaxis] <= high) & (low <= high[rows, np.newaxis]),
+            axis=2,
+        )
+        # each pair once, leaving out neighbours along the polyline
+        overlap &= i + 1 < later
+        if closed:
+            overlap &= ~((0 == i) & (count - 1 == later))
+        for a, b in zip(*np.nonzero(overlap)):
+            a, b = first + int(a), int(b)
+            found = crossing(
+                points[a], points[a + 1], points[b], points[b + 1], tolerance
+            )
+            if found is not None:
+                return found
+    return None
+
+
+def first_backtrack(
+    points: list[Point], closed: bool, limit: float = -0.999
+) -> Point | None:
+    """A vertex where the polyline turns straight back on itself, if any.
+
+    Such cusps leave a sliver of no width that is not seen as a crossing;
+    `limit` is the cosine of the sharpest turn still allowed.
+    """
+    corners = range(0 if closed else 1, len(points) - 1)
+    for k in corners:
+        a = points[k - 1] if 0 < k else points[-2]
+        b, c = points[k], points[k + 1]
+        ux, uy = b.x - a.x, b.y - a.y
+        vx, vy = c.x - b.x, c.y - b.y
+        norms = hypot(ux, uy) * hypot(vx, vy)
+        if norms and (ux * vx + uy * vy) / norms < limit:
+            return b
+    return None
+
+
+def check_outlines(
+    contours: Sequence[Contour], tolerance: float = 1e-3
+) -> list[Finding]:
+    """Closure and self-intersection findings for the outline contours."""
+    findings = []
+    outlines = [c for c in contours if c.layer in OUTLINE_LAYERS]
+    for chain in chain_outlines(outlines, tolerance):
+        gap = (chain[-1] - chain[0]).length
+        closed = gap <= tolerance
+        if not closed:
+            findings.append(
+                Finding("closure", "outline left open by", chain[-1], gap)
+            )
+        if closed:
+            chain = chain[:-1] + [chain[0]]
+        found = first_crossing(chain, closed, tolerance)
+        if found is not None:
+            findings.append(
+                Finding("intersection", "outline crosses itself", found)
+            )
+        found = first_backtrack(chain, closed)
+        if found is not None:
+            findings.append(
+                Finding("intersection", "outline doubles back", found)
+            )
+    return findings
@@ -1,30 +1,61 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import ClassVar
 
-from drawsvg import Circle
 from drawsvg import Group
-from drawsvg import Line
-from drawsvg import Path
 
 from elephantbox.boxes.component.Abstract import RectangularBox
 from elephantbox.boxes.component.Defaults import FINGER_CUTS_KWARGS
 from elephantbox.boxes.component.Defaults import TAB_CUT_KWARGS
+from elephantbox.boxes.component.EdgeProgram import EdgeProgram
 from elephantbox.math.Geometry import Point
 from elephantbox.math.Geometry import Segment
 from elephantbox.math.Geometry import summation_sequence
 from elephantbox.math.Geometry import symetric_mirrored_summation_sequence
 from elephantbox.support.Argumentable import AKW_TYPE
 from elephantbox.support.Argumentable import Argumentable
+from elephantbox.support.CompactPath import CompactPath
 from elephantbox.support.Laserable import Gridable
 
 
+# least stock left between two panels cut side by side, in inches
+MIN_PANEL_WEB = 0.1
+
+
 @dataclass(frozen=True)
 class FivePanelFingerBox(
     RectangularBox,
     Gridable,
     Argumentable,
 ):
+    OUTLINE_PROGRAM: ClassVar[EdgeProgram | None] = EdgeProgram(
+        (
+            (3, 0, None),
+            (3, 1, False),
+            (3, 2, False),
+            (3, 3, False),
+            (3, 4, False),
+            (3, 5, False),
+            (0, 5, None),
+            (0, 4, False),
+            (0, 3, False),
+            (0, 2, False),
+            (0, 1, False),
+            (0, 0, False),
+        )
+    )
+    SIDES_PROGRAM: ClassVar[EdgeProgram | None] = EdgeProgram(
+        (
+            (0, 0, False),
+            (0, 1, False),
+            (0, 2, False),
+            (1, 2, False),
+            (1, 1, False),
+            (1, 0, False),
+        )
+    )
+
     @classmethod
     def dimension_arguments(cls) -> list[AKW_TYPE]:
         return super().dimension_arguments() + []
@@ -45,10 +76,20 @@ class FivePanelFingerBox(
         offset = 0
         return [i + offset for i in seq]
 
+    @property
+    def panel_web(self) -> float:
+        """Stock left between the main panel and the sides panel.
+
+        A stock thickness, but never less than MIN_PANEL_WEB, so thin stock
+        does not leave a sliver between two parallel cuts.
+        """
+        return max(self.stock_thickness, MIN_PANEL_WEB * self.dpi)
+
     @property
     def sides_origin(self) -> Point:
+        # the sides panel's fingers reach a stock thickness left of it
         return Point(
-            self.vertical_rails[3] + self.stock_thickness + 10,
+            self.vertical_rails[3] + self.stock_thickness + self.panel_web,
             self.horizontal_rails[0],
         )
 
@@ -66,104 +107,43 @@ class FivePanelFingerBox(
 
         return grp
 
-    def cut_outline(self) -> Group:
-        grp = Group()
-        dots = Group()
-        d = self.dasher
-
-        main_cut_path = Path(**FINGER_CUTS_KWARGS)
-        main_cut_path.M(
-            self.vertical_rails[3],
-            self.horizontal_rails[0],
+    @property
+    def sides_rails(self) -> tuple[list[float], list[float]]:
+        return (
+            [self.sides_origin.x + 0, self.sides_origin.x + self.height],
+            [
+                self.sides_origin.y + 0,
+                self.sides_origin.y + self.depth,
+                self.sides_origin.y + 2 * self.depth,
+            ],
         )
 
-        r = len(self.horizontal_rails)
-
-        seq = []
-        for j in range(r - 1):
-            k = (j + 1) % r
-            seq.append((3, j, k))
-        for j in reversed(range(r - 1)):
-            k = (j + 1) % r
-            seq.append((0, k, j))
-        for i, j, k in seq:
-            start = Point(self.vertical_rails[i], self.horizontal_rails[j])
-            end = Point(self.vertical_rails[i], self.horizontal_rails[k])
-
-            d.drive_zigzag(main_cut_path, Segment(start, end))
-
-            dots.append(
-                Circle(
-                    *start.tuple,
-                    5,
-                    fill="blue",
-                    opacity="50%",
-                )
-            )
-            dots.append(
-                Circle(
-                    *end.tuple,
-                    5,
-                    fill="#0000",
-                    stroke="red",
-                    stroke_width=5,
-                    opacity="50%",
-                )
-            )
-
-        main_cut_path.Z()
-        grp.append(main_cut_path)
-
-        sides_cut_path = Path(**FINGER_CUTS_KWARGS)
-
-        sides_cut_path.M(*self.sides_origin.tuple)
-
-        side_points = [
-            Point(0, 0),
-            Point(0, self.depth),
-            Point(0, 2 * self.depth),
-            Point(self.height, 2 * self.depth),
-            Point(self.height, self.depth),
-            Point(self.height, 0),
-            Point(0, 0),
+    def program_rails(self) -> list[tuple[EdgeProgram | None, tuple]]:
+        return [
+            (
+                self.OUTLINE_PROGRAM,
+                (self.vertical_rails, self.horizontal_rails),
+            ),
+            (self.SIDES_PROGRAM, self.sides_rails),
         ]
-        last_point = None
-        for destination in side_points:
-            if last_point is not None:
-                start = self.sides_origin + last_point
-                end = self.sides_origin + destination
-
-                d.drive_zigzag(
-                    sides_cut_path,
-                    Segment(start, end),
-                )
-
-                dots.append(
-                    Circle(
-                        *start.tuple,
-                        5,
-                        fill="blue",
-                        opacity="50%",
-                    )
-                )
-                dots.append(
-                    Circle(
-                        *end.tuple,
-                        5,
-                        fill="#0000",
-                        stroke="red",
-                        stroke_width=5,
-                        opacity="50%",
-                    )
-                )
-            last_point = destination
 
-        # sides_cut_path.Z()
-        grp.append(sides_cut_path)
+    def outline_paths(self) -> list[CompactPath]:
+        return [
+            program.drive(
+                self.dasher, CompactPath(**FINGER_CUTS_KWARGS), *rails
+            )
+            for program, rails in self.program_rails()
+            if program is not None
+        ]
 
+    def cut_outline(self) -> Group:
+        grp = super().cut_outline()
         if self.debug:
+            dots = Group()
+            for program, rails in self.program_rails():
+                if program is not None:
+                    dots.append(program.dots(*rails))
             grp.append(dots)
-
         return grp
 
     def inner_cuts(self) -> Group:
@@ -195,11 +175,9 @@ class FivePanelFingerBox(
         )
 
         grp.append(
-            Line(
-                *(self.sides_origin + Point(0, self.depth)).tuple,
-                *(self.sides_origin + Point(self.height, self.depth)).tuple,
-                **TAB_CUT_KWARGS,
-            )
+            CompactPath(capacity=2, **TAB_CUT_KWARGS)
+            .M(*(self.sides_origin + Point(0, self.depth)).tuple)
+            .L(*(self.sides_origin + Point(self.height, self.depth)).tuple)
         )
 
         return grp
@@ -209,6 +187,31 @@ class FivePanelFingerBox(
 class CompactTallFivePanelFingerBox(
     FivePanelFingerBox,
 ):
+    OUTLINE_PROGRAM = EdgeProgram(
+        (
+            (0, 0, True),
+            (0, 1, True),
+            (0, 2, True),
+            (0, 3, True),
+            (0, 4, True),
+            (0, 5, True),
+            (0, 5, True),
+            (1, 5, True),
+            (2, 5, True),
+            (3, 5, True),
+            (3, 4, True),
+            (3, 3, True),
+            (3, 2, True),
+            (4, 2, False),
+            (4, 1, False),
+            (4, 0, False),
+            (3, 0, False),
+            (2, 0, False),
+            (1, 0, False),
+        )
+    )
+    SIDES_PROGRAM = None
+
     @property
     def main_origin(self):
         return Point(min(self.vertical_rails), min(self.horizontal_rails))
@@ -274,7 +277,7 @@ class CompactTallFivePanelFingerBox(
             )
         )
 
-        little_path = Path(**TAB_CUT_KWARGS)
+        little_path = CompactPath(**TAB_CUT_KWARGS)
         little_path.M(self.vertical_rails[3], self.horizontal_rails[0])
         self.dasher.drive_zigzag(
             little_path,
@@ -293,8 +296,9 @@ class CompactTallFivePanelFingerBox(
         grp.append(little_path)
 
         grp.append(
-            Line(
-                *(self.main_origin + Point(0, self.depth)).tuple,
+            CompactPath(capacity=2, **TAB_CUT_KWARGS)
+            .M(*(self.main_origin + Point(0, self.depth)).tuple)
+            .L(
                 *(
                     self.main_origin
                     + Point(
@@ -302,121 +306,49 @@ class CompactTallFivePanelFingerBox(
                         self.depth,
                     )
                 ).tuple,
-                **TAB_CUT_KWARGS,
             )
         )
 
         return grp
 
-    def cut_outline(self) -> Group:
-        grp = Group()
-        dots = Group()
-        d = self.dasher
 
-        main_cut_path = Path(**FINGER_CUTS_KWARGS)
-
-        seq = [
-            (0, 0, True),
+@dataclass(frozen=True)
+class CompactWideFivePanelFingerBox(
+    FivePanelFingerBox,
+):
+    OUTLINE_PROGRAM = EdgeProgram(
+        (
+            #
+            (0, 0, False),
             (0, 1, True),
+            #
             (0, 2, True),
-            (0, 3, True),
-            (0, 4, True),
-            (0, 5, True),
-            (0, 5, True),
-            (1, 5, True),
+            (1, 2, True),
+            # #
+            (2, 2, False),  # *
+            (2, 3, True),
+            (2, 4, True),
+            # #
             (2, 5, True),
             (3, 5, True),
-            (3, 4, True),
-            (3, 3, True),
-            (3, 2, True),
+            (4, 5, True),
+            (5, 5, True),
+            # #
+            (5, 4, True),
+            (5, 3, True),
+            (5, 2, False),  # *
+            # #
             (4, 2, False),
             (4, 1, False),
             (4, 0, False),
+            #
             (3, 0, False),
             (2, 0, False),
             (1, 0, False),
-        ]
-        begining = seq[0]
-        end = None
-        for ix, iy, invert in seq:
-            start = Point(self.vertical_rails[ix], self.horizontal_rails[iy])
-            if end is None:
-                main_cut_path.M(*start.tuple)
-                dots.append(
-                    Circle(
-                        *start.tuple,
-                        15,
-                        fill="#0000",
-                        stroke="green",
-                        stroke_width=5,
-                        opacity="50%",
-                    )
-                )
-            else:
-                d.drive_zigzag(
-                    main_cut_path,
-                    Segment(
-                        end,
-                        start,
-                    ),
-                    invert=invert,
-                )
-                if self.debug:
-                    dots.append(
-                        Circle(
-                            *start.tuple,
-                            5,
-                            fill="blue",
-                            opacity="50%",
-                        )
-                    )
-                    dots.append(
-                        Circle(
-                            *end.tuple,
-                            5,
-                            fill="#0000",
-                            stroke="red",
-                            stroke_width=5,
-                            opacity="50%",
-                        )
-                    )
-            end = start
-        if end is not None:
-            # closing
-            ix = int(begining[0])
-            iy = int(begining[1])
-            invert = bool(begining[2])
-            start = Point(self.vertical_rails[ix], self.horizontal_rails[iy])
-            d.drive_zigzag(
-                main_cut_path,
-                Segment(end, start),
-                invert=invert,
-            )
-            end = start
-            # /closing
-            dots.append(
-                Circle(
-                    *end.tuple,
-                    15,
-                    fill="#0000",
-                    stroke="red",
-                    stroke_width=5,
-                    opacity="50%",
-                )
-            )
-        # main_cut_path.Z()
-        grp.append(main_cut_path)
-
-        if self.debug:
-            grp.append(dots)
-
-        return grp
-
+        )
+    )
+    SIDES_PROGRAM = None
 
-@dataclass(frozen=True)
-class CompactWideFivePanelFingerBox(
-    FivePanelFingerBox,
-):
     @property
     def main_origin(self):
         return Point(min(self.vertical_rails), min(self.horizontal_rails))
@@ -471,7 +403,7 @@ class CompactWideFivePanelFingerBox(
             )
         )
 
-        little_path = Path(**TAB_CUT_KWARGS)
+        little_path = CompactPath(**TAB_CUT_KWARGS)
         little_path.M(self.vertical_rails[3], self.horizontal_rails[0])
         self.dasher.drive_zigzag(
             little_path,
@@ -490,8 +422,9 @@ class CompactWideFivePanelFingerBox(
         grp.append(little_path)
 
         grp.append(
-            Line(
-                *(self.main_origin + Point(0, self.depth)).tuple,
+            CompactPath(capacity=2, **TAB_CUT_KWARGS)
+            .M(*(self.main_origin + Point(0, self.depth)).tuple)
+            .L(
                 *(
                     self.main_origin
                     + Point(
@@ -499,7 +432,6 @@ class CompactWideFivePanelFingerBox(
                         self.depth,
                     )
                 ).tuple,
-                **TAB_CUT_KWARGS,
             )
         )
 
@@ -507,108 +439,3 @@ class CompactWideFivePanelFingerBox(
 
     def p_ixy(self, ix, iy) -> Point:
         return Point(self.vertical_rails[ix], self.horizontal_rails[iy])
-
-    def cut_outline(self) -> Group:
-        grp = Group()
-        dots = Group()
-        d = self.dasher
-
-        main_cut_path = Path(**FINGER_CUTS_KWARGS)
-
-        seq: list[tuple[int, int, bool]] = [
-            #
-            (0, 0, False),
-            (0, 1, True),
-            #
-            (0, 2, True),
-            (1, 2, True),
-            # #
-            (2, 2, False),  # *
-            (2, 3, True),
-            (2, 4, True),
-            # #
-            (2, 5, True),
-            (3, 5, True),
-            (4, 5, True),
-            (5, 5, True),
-            # #
-            (5, 4, True),
-            (5, 3, True),
-            (5, 2, False),  # *
-            # #
-            (4, 2, False),
-            (4, 1, False),
-            (4, 0, False),
-            #
-            (3, 0, False),
-            (2, 0, False),
-            (1, 0, False),
-        ]
-        begining = tuple(seq[0])
-        end = None
-        for ix, iy, invert in seq:
-            start = self.p_ixy(ix, iy)
-            if end is None:
-                main_cut_path.M(*start.tuple)
-                dots.append(
-                    Circle(
-                        *start.tuple,
-                        15,
-                        fill="#0000",
-                        stroke="green",
-                        stroke_width=5,
-                        opacity="50%",
-                    )
-                )
-            else:
-                d.drive_zigzag(
-                    main_cut_path,
-                    Segment(end, start),
-                    invert=invert,
-                )
-                if self.debug:
-                    dots.append(
-                        Circle(*start.tuple, 5, fill="blue", opacity="50%")
-                    )
-                    # dots.append(
-                    #     Circle(
-                    #         *end.tuple,
-                    #         5,
-                    #         fill="#0000",
-                    #         stroke="red",
-                    #         stroke_width=5,
-                    #         opacity="50%",
-                    #     )
-                    # )
-            end = start
-        if end is not None:
-            # closing
-            ix = int(begining[0])
-            iy = int(begining[1])
-            invert = bool(begining[2])
-            start = Point(self.vertical_rails[ix], self.horizontal_rails[iy])
-            d.drive_zigzag(
-                main_cut_path,
-                Segment(end, start),
-                invert=invert,
-            )
-            end = start
-            # /closing
-
-            dots.append(
-                Circle(
-                    *end.tuple,
-                    15,
-                    fill="#0000",
-                    stroke="red",
-                    stroke_width=5,
-                    opacity="50%",
-                )
-            )
-        # main_cut_path.Z()
-        grp.append(main_cut_path)
-
-        if self.debug:
-            grp.append(dots)
-
-        return grp
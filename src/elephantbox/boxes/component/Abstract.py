@@ -19,6 +19,7 @@ class Box(Validatable, Laserable, Argumentable):
     dasher: Dasher
 
     guide: bool
+    guide_cells: bool
 
     @classmethod
     @property
@@ -35,8 +36,12 @@ class Box(Validatable, Laserable, Argumentable):
     def feature_arguments(cls) -> list[AKW_TYPE]:
         return super().feature_arguments() + [
             akw("--guide", action="store_true"),
+            akw("--guide-cells", action="store_true"),
         ]
 
+    def parts(self) -> list[Validatable]:
+        return super().parts() + [self.dasher]
+
 
 @dataclass(frozen=True)
 class RectangularBox(Box):
@@ -7,11 +7,11 @@ from math import sqrt
 
 from drawsvg import Circle
 from drawsvg import Group
-from drawsvg import Path
 
 from elephantbox.boxes.component.Dash import Dasher
 from elephantbox.math.Geometry import deg2rad
 from elephantbox.math.Geometry import Point
+from elephantbox.support.CompactPath import CompactPath
 from elephantbox.support.Validatable import Validatable
 
 
@@ -32,9 +32,11 @@ class CicleLock(Validatable):
         return super().assertions() + [
             (0 <= self.corner_saver, "positive corner_saver"),
             (
-                -self.fold_height <= self.gap_cut
-                if self.fold_height is not None and self.fold_height < 0
-                else True,
+                self.fold_height is None
+                or (
+                    (0 <= self.fold_height)
+                    | (-self.fold_height <= self.gap_cut)
+                ),
                 "Real Fold solution when Fold Height is negative",
             ),
         ]
@@ -104,7 +106,7 @@ class CicleLock(Validatable):
         C = self.outer_gap_corner_point.mirror_x
         D = self.outer_gap_corner_point
 
-        cut_path = Path(**cut_obj_kwargs)
+        cut_path = CompactPath(**cut_obj_kwargs)
         cut_path.M(A.x, A.y).A(
             *(self.radius - self.gap_cut, self.radius - self.gap_cut),
             *(0, 0 < self.tab_angle, 0),
@@ -184,7 +186,7 @@ class CicleLock(Validatable):
         grp = Group(
             transform=f"translate( {origin.x} {origin.y} ) rotate( {angle} )",
         )
-        cut_path = Path(**cut_obj_kwargs)
+        cut_path = CompactPath(**cut_obj_kwargs)
 
         left = self.left_slot_corner_point
         right = self.left_slot_corner_point.mirror_x
@@ -1,28 +1,90 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
+from dataclasses import replace
 from math import ceil
+from math import cos
+from math import floor
+from math import sin
 
+import numpy as np
 from drawsvg import Circle
 from drawsvg import Group
-from drawsvg import Line
-from drawsvg import Path
 
 from elephantbox.boxes.component.Defaults import DEBUG_OBJ_KWARGS
 from elephantbox.math.Geometry import Point
 from elephantbox.math.Geometry import Segment
+from elephantbox.support.Argumentable import akw
 from elephantbox.support.Argumentable import AKW_TYPE
 from elephantbox.support.Argumentable import Argumentable
 from elephantbox.support.Argumentable import fl_akw
+from elephantbox.support.CompactPath import CompactPath
 from elephantbox.support.Validatable import Validatable
 
 
+class DashBudgetExceeded(Exception):
+    pass
+
+
+@dataclass
+class DashLedger:
+    """Running tally of the dashes a Dasher has been asked for."""
+
+    requested: int = 0
+    generated: int = 0
+    spans: int = 0
+    coarsened_spans: int = 0
+    widened_spans: int = 0
+
+    def reset(self):
+        """Start the tally over for a new drawing."""
+        self.requested = self.generated = self.spans = 0
+        self.coarsened_spans = self.widened_spans = 0
+
+    @contextmanager
+    def apart(self):
+        """Tally the dashes made in the block on their own, then restore."""
+        saved = replace(self)
+        self.reset()
+        try:
+            yield self
+        finally:
+            for f in fields(self):
+                setattr(self, f.name, getattr(saved, f.name))
+
+    def record(self, requested: int, generated: int):
+        self.spans += 1
+        self.requested += requested
+        self.generated += generated
+        if generated < requested:
+            self.coarsened_spans += 1
+
+    def report(self) -> str:
+        return (
+            f"{self.generated} dashes generated over {self.spans} spans"
+            f" ({self.requested} requested,"
+            f" {self.coarsened_spans} spans coarsened)"
+        )
+
+
 @dataclass(frozen=True)
 class Dasher(Validatable, Argumentable):
     model_dash_length: float
     model_dash_period: float
     stock_thickness: float
 
+    max_span_dashes: int = 0
+    max_drawing_dashes: int = 0
+    coarsen_dashes: bool = False
+    min_feature: float = 0
+    fix_features: bool = False
+
+    ledger: DashLedger = field(default_factory=DashLedger, compare=False)
+
     @classmethod
     @property
     def meta_name(cls) -> str:
@@ -34,6 +96,26 @@ class Dasher(Validatable, Argumentable):
             fl_akw("--dash-length", dest="model_dash_length"),
             fl_akw("--dash-period", dest="model_dash_period"),
             fl_akw("--stock-thickness"),
+            fl_akw("--min-feature"),
+        ]
+
+    @classmethod
+    def feature_arguments(cls) -> list[AKW_TYPE]:
+        return super().feature_arguments() + [
+            akw(
+                "--max-span-dashes",
+                type=int,
+                default=500,
+                metavar="COUNT",
+            ),
+            akw(
+                "--max-drawing-dashes",
+                type=int,
+                default=20000,
+                metavar="COUNT",
+            ),
+            akw("--coarsen-dashes", action="store_true"),
+            akw("--fix-features", action="store_true"),
         ]
 
     def assertions(self) -> list[tuple[bool, str]]:
@@ -46,41 +128,133 @@ class Dasher(Validatable, Argumentable):
                 0 < self.model_dash_period,
                 "model_dash_period is greater than Zero",
             ),
+            (
+                0 <= self.max_span_dashes,
+                "max_span_dashes is not Negative",
+            ),
+            (
+                0 <= self.max_drawing_dashes,
+                "max_drawing_dashes is not Negative",
+            ),
+            (
+                0 <= self.min_feature,
+                "min_feature is not Negative",
+            ),
         ]
 
-    def span_sequence(
-        self,
-        segment: Segment,
-    ) -> list[Segment]:
-        dash_line = []
+    def dash_allowance(self) -> int | None:
+        """Most dashes the next span may use, or None when unbounded."""
+        budgets = []
+        if self.max_span_dashes:
+            budgets.append(self.max_span_dashes)
+        if self.max_drawing_dashes:
+            budgets.append(self.max_drawing_dashes - self.ledger.generated)
+        if not budgets:
+            return None
+        return min(budgets)
 
-        period_count = ceil(
-            (segment.length - self.model_dash_length + 0.001)
-            / self.model_dash_period
-        )
-        model_length = (
-            self.model_dash_length + period_count * self.model_dash_period
-        )
-        scale_factor = segment.length / model_length
+    def widened_period_count(self, segment: Segment, period_count: int) -> int:
+        """Periods a span may keep with no dash or gap under min_feature.
 
-        actual_dash_length_vector = Point.polar(
-            self.model_dash_length * scale_factor, segment.angle
+        Fewer periods stretch the pattern to fill the span, widening dashes
+        and gaps alike; a span keeps at least one gap even if it stays narrow.
+        """
+        if not self.fix_features or not self.min_feature:
+            return period_count
+        narrowest = min(
+            self.model_dash_length,
+            self.model_dash_period - self.model_dash_length,
         )
-        actual_period_vector = Point.polar(
-            self.model_dash_period * scale_factor, segment.angle
+        if narrowest <= 0:
+            return period_count
+        most = floor(
+            (
+                segment.length * narrowest / self.min_feature
+                - self.model_dash_length
+            )
+            / self.model_dash_period
         )
+        widened = max(most, min(period_count, 1))
+        if widened < period_count:
+            self.ledger.widened_spans += 1
+        return min(widened, period_count)
 
-        for n in range(period_count + 1):
-            start = segment.start + (actual_period_vector * n)
-            end = start + actual_dash_length_vector
+    def budget_period_count(self, segment: Segment, period_count: int) -> int:
+        requested = period_count + 1
+        allowance = self.dash_allowance()
 
-            dash_line.append(Segment(start, end))
+        if allowance is not None and allowance < requested:
+            if not self.coarsen_dashes or allowance < 2:
+                raise DashBudgetExceeded(
+                    f"{requested} dashes requested for a"
+                    f" {segment.length / self.dpi:.4g} span"
+                    f" ({self.ledger.generated + requested} in the drawing"
+                    f" so far), budget allows {max(allowance, 0)};"
+                    " check --dash-period or raise --max-span-dashes"
+                    " / --max-drawing-dashes"
+                )
+            period_count = allowance - 1
+
+        self.ledger.record(requested, period_count + 1)
+        return period_count
+
+    def span_arrays(self, segments: Sequence[Segment]) -> list[np.ndarray]:
+        """Dashes along each segment, generated for all of them at once.
+
+        Period counts are settled segment by segment, in order, so budgets
+        and the ledger see the same spans as one `span_array` call apiece.
+        """
+        if not segments:
+            return []
+        counts, origins, dash_vectors, period_vectors = [], [], [], []
+        for segment in segments:
+            period_count = ceil(
+                (segment.length - self.model_dash_length + 0.001)
+                / self.model_dash_period
+            )
+            period_count = self.widened_period_count(segment, period_count)
+            period_count = self.budget_period_count(segment, period_count)
+            model_length = (
+                self.model_dash_length + period_count * self.model_dash_period
+            )
+            scale_factor = segment.length / model_length
+
+            direction = np.array([cos(segment.angle), sin(segment.angle)])
+            dash_vectors.append(
+                direction * self.model_dash_length * scale_factor
+            )
+            period_vectors.append(
+                direction * self.model_dash_period * scale_factor
+            )
+            origins.append(segment.start.tuple)
+            counts.append(period_count + 1)
+
+        counts = np.array(counts)
+        owners = np.repeat(np.arange(len(segments)), counts)
+        firsts = np.cumsum(counts) - counts
+        n = (np.arange(len(owners)) - firsts[owners])[:, np.newaxis]
+        starts = (
+            np.array(origins)[owners] + n * np.array(period_vectors)[owners]
+        )
+        ends = starts + np.array(dash_vectors)[owners]
+
+        return np.split(np.stack([starts, ends], axis=1), firsts[1:])
 
-        # print(segment.angle)
-        # print(actual_dash_length_vector)
-        # print(actual_period_vector)
+    def span_array(
+        self,
+        segment: Segment,
+    ) -> np.ndarray:
+        """Dashes along a segment as an (n, 2, 2) array of start/end points."""
+        return self.span_arrays([segment])[0]
 
-        return dash_line
+    def span_sequence(
+        self,
+        segment: Segment,
+    ) -> list[Segment]:
+        return [
+            Segment(Point(*start), Point(*end))
+            for start, end in self.span_array(segment).tolist()
+        ]
 
     def span(
         self,
@@ -98,10 +272,9 @@ class Dasher(Validatable, Argumentable):
             )
         ):
             dashes.append(
-                Line(
-                    *segment.tuple,
-                    **kwargs,
-                )
+                CompactPath(capacity=2, **kwargs)
+                .M(*segment.start.tuple)
+                .L(*segment.end.tuple)
             )
 
         if self.debug:
@@ -110,30 +283,68 @@ class Dasher(Validatable, Argumentable):
 
         return dashes
 
+    def zigzag_arrays(
+        self,
+        segments: Sequence[Segment],
+        inverts: Sequence[bool],
+    ) -> list[np.ndarray]:
+        """Finger-joint zigzag vertices along each segment, in order."""
+        offsets = []
+        for segment, invert in zip(segments, inverts):
+            ortho_delta = Point.polar(
+                self.stock_thickness, segment.delta.angle_ortho
+            )
+            if invert:
+                ortho_delta *= -1
+            offsets.append(ortho_delta.tuple)
+        spans = self.span_arrays(segments)
+        if not spans:
+            return []
+
+        dashes = np.concatenate(spans)
+        owners = np.repeat(np.arange(len(spans)), [len(s) for s in spans])
+        starts = dashes[:, 0]
+        ends = dashes[:, 1]
+        # a tooth joins each dash to the next one along the same segment
+        offset = np.array(offsets)[owners[1:]]
+        teeth = np.stack(
+            [
+                ends[:-1] + offset,
+                starts[1:] + offset,
+                starts[1:],
+                ends[1:],
+            ],
+            axis=1,
+        )[owners[1:] == owners[:-1]]
+        teeth = np.split(teeth, np.cumsum([len(s) - 1 for s in spans])[:-1])
+
+        return [
+            np.concatenate(
+                [
+                    np.array([segment.start.tuple]),
+                    span[:1, 1],
+                    tooth.reshape(-1, 2),
+                ]
+            )
+            for segment, span, tooth in zip(segments, spans, teeth)
+        ]
+
+    def zigzag_points(
+        self,
+        segment: Segment,
+        invert: bool = False,
+    ) -> np.ndarray:
+        """Vertices of a finger-joint zigzag along a segment, in order."""
+        return self.zigzag_arrays([segment], [invert])[0]
+
     def drive_zigzag(
         self,
-        path: Path,
+        path: CompactPath,
         segment: Segment,
         invert: bool = False,
-    ) -> Path:
+    ) -> CompactPath:
         self.validate()
-        ortho_delta = Point.polar(
-            self.stock_thickness, segment.delta.angle_ortho
-        )
-        if invert:
-            ortho_delta *= -1
-        path.L(*segment.start.tuple)
-        last_endpoint = None
-        for dash in self.span_sequence(segment):
-            if last_endpoint is not None:
-                in_point = last_endpoint + ortho_delta
-                out_point = dash.start + ortho_delta
-                path.L(*in_point.tuple)
-                path.L(*out_point.tuple)
-                path.L(*dash.start.tuple)
-            path.L(*dash.end.tuple)
-            last_endpoint = dash.end
-        return path
+        return path.extend_lines(self.zigzag_points(segment, invert))
 
     def zigzag(
         self,
@@ -143,7 +354,7 @@ class Dasher(Validatable, Argumentable):
     ) -> Group:
         dashes = Group()
 
-        cut_path = Path(**kwargs)
+        cut_path = CompactPath(**kwargs)
         cut_path.M(*segment.start.tuple)
         self.drive_zigzag(
             path=cut_path,
@@ -51,3 +51,25 @@ FINGER_CUTS_KWARGS = kwarg_dict(
     stroke="black",
     stroke_width=2,
 )
+
+
+LAYER_KWARGS = {
+    "body_cut": BODY_CUT_KWARGS,
+    "finger_cut": FINGER_CUTS_KWARGS,
+    "tab_cut": TAB_CUT_KWARGS,
+    "slot_cut": SLOT_CUT_KWARGS,
+    "fold": FOLD_PERFERATION_KWARGS,
+}
+
+OUTLINE_LAYERS = ("body_cut", "finger_cut")
+FOLD_LAYERS = ("fold",)
+
+
+def layer_of(style: dict) -> str | None:
+    """Name of the Defaults style a drawn element was given, if any."""
+    for name, kwargs in LAYER_KWARGS.items():
+        if style.get("stroke") == kwargs.get("stroke") and style.get(
+            "fill"
+        ) == kwargs.get("fill"):
+            return name
+    return None
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from drawsvg import Circle
+from drawsvg import Group
+
+from elephantbox.boxes.component.Dash import Dasher
+from elephantbox.math.Geometry import Point
+from elephantbox.math.Geometry import Segment
+from elephantbox.support.CompactPath import CompactPath
+
+
+@dataclass(frozen=True)
+class EdgeProgram:
+    """A loop around a rail grid, as the rail crossings it visits in order.
+
+    Each step names a crossing and how the edge into it is cut: a zigzag,
+    inverted or not, or a straight line. The first step's edge is the one
+    that closes the loop, and a straight close is a `Z`.
+    """
+
+    # (vertical rail, horizontal rail, invert); an invert of None cuts straight
+    steps: tuple[tuple[int, int, bool | None], ...]
+
+    def vertices(
+        self,
+        vertical_rails: Sequence[float],
+        horizontal_rails: Sequence[float],
+    ) -> list[Point]:
+        return [
+            Point(vertical_rails[ix], horizontal_rails[iy])
+            for ix, iy, _ in self.steps
+        ]
+
+    def drive(
+        self,
+        dasher: Dasher,
+        path: CompactPath,
+        vertical_rails: Sequence[float],
+        horizontal_rails: Sequence[float],
+    ) -> CompactPath:
+        """Draw the loop onto `path`, with every zigzag made in one batch."""
+        dasher.validate()
+        vertices = self.vertices(vertical_rails, horizontal_rails)
+        inverts = [invert for _, _, invert in self.steps]
+        # edge k runs into vertex k, so the closing edge comes last
+        edges = list(zip(vertices[:-1], vertices[1:], inverts[1:]))
+        edges.append((vertices[-1], vertices[0], inverts[0]))
+
+        zigzags = iter(
+            dasher.zigzag_arrays(
+                [Segment(a, b) for a, b, invert in edges if invert is not None],
+                [invert for _, _, invert in edges if invert is not None],
+            )
+        )
+
+        path.M(*vertices[0].tuple)
+        for k, (_, end, invert) in enumerate(edges):
+            if invert is not None:
+                path.extend_lines(next(zigzags))
+            elif len(edges) - 1 == k:
+                path.Z()
+            elif edges[k + 1][2] is None:
+                # a zigzag starts with a line to its own first vertex
+                path.L(*end.tuple)
+        return path
+
+    def dots(
+        self,
+        vertical_rails: Sequence[float],
+        horizontal_rails: Sequence[float],
+    ) -> Group:
+        """Debug markers: where the loop starts and each crossing it visits."""
+        vertices = self.vertices(vertical_rails, horizontal_rails)
+        dots = Group()
+        dots.append(
+            Circle(
+                *vertices[0].tuple,
+                15,
+                fill="#0000",
+                stroke="green",
+                stroke_width=5,
+                opacity="50%",
+            )
+        )
+        for vertex in vertices[1:]:
+            dots.append(Circle(*vertex.tuple, 5, fill="blue", opacity="50%"))
+        return dots
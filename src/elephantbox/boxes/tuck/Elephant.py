@@ -2,19 +2,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from drawsvg import Group
-from drawsvg import Path
-
 from elephantbox.boxes.component.Abstract import RectangularTuckBox
 from elephantbox.boxes.component.Defaults import BODY_CUT_KWARGS
 from elephantbox.math.Geometry import Point
-from elephantbox.math.Geometry import rotated_size
 from elephantbox.math.Geometry import sqrt2over2
 from elephantbox.support.Argumentable import AKW_TYPE
 from elephantbox.support.Argumentable import Argumentable
 from elephantbox.support.Argumentable import fl_akw
+from elephantbox.support.CompactPath import CompactPath
 from elephantbox.support.Laserable import Laserable
 from elephantbox.support.Laserable import SpanableList
+from elephantbox.support.PathTemplate import templated_path
 
 
 @dataclass(frozen=True)
@@ -39,16 +37,17 @@ class ElephantBox(
 
     def assertions(self) -> list[tuple[bool, str]]:
         return super().assertions() + [
+            # `&` rather than chained comparisons, so arrays can be screened
             (
-                0 < self.ear_flap <= self.depth,
+                (0 < self.ear_flap) & (self.ear_flap <= self.depth),
                 "Non Negative Ear Flap -lt depth",
             ),
             (
-                0 <= self.back_support <= self.height,
+                (0 <= self.back_support) & (self.back_support <= self.height),
                 "Pos Back Support -lt height",
             ),
             (
-                0 <= self.side_support <= self.width,
+                (0 <= self.side_support) & (self.side_support <= self.width),
                 "Pos Side Support -lt width",
             ),
             (
@@ -168,27 +167,26 @@ class ElephantBox(
 
     @property
     def rotated_size(self) -> float:
-        return max(
-            [
-                rotated_size(
-                    self.point_diagonal_top_left,
-                    self.point_diagonal_bottom_right_nose,
-                ),
-                rotated_size(
-                    self.point_diagonal_top_left,
-                    self.point_diagonal_bottom_right_face,
-                ),
-                rotated_size(
-                    self.point_diagonal_top_left,
-                    self.point_diagonal_bottom_right_ear,
-                ),
-            ]
+        """Extent along the top-left to bottom-right diagonal."""
+        return self.rotated_bounds(-45).width
+
+    def outline_branches(self) -> tuple[bool, ...]:
+        return (
+            0 < self.side_support,
+            0 < self.back_support,
+            0 == self.ear_flap,
+            0 == self.nose_width,
         )
 
-    def cut_outline(self) -> Group:
-        grp = Group()
+    def outline_paths(self) -> list[CompactPath]:
+        return [
+            templated_path(
+                self, type(self).outline_path, type(self).outline_branches
+            )
+        ]
 
-        cutPath = Path(**BODY_CUT_KWARGS)
+    def outline_path(self) -> CompactPath:
+        cutPath = CompactPath(**BODY_CUT_KWARGS)
 
         # # Body
         cutPath.M(self.body_vertical_rails[9], self.body_horizontal_rails[3]).A(
@@ -327,9 +325,7 @@ class ElephantBox(
         # close off
         cutPath.Z()
 
-        grp.append(cutPath)
-
-        return grp
+        return cutPath
 
     def foldList(self) -> SpanableList:
         foldList = [
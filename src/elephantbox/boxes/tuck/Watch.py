@@ -4,7 +4,6 @@ from dataclasses import dataclass
 
 from drawsvg import Circle
 from drawsvg import Group
-from drawsvg import Path
 from drawsvg import Rectangle
 
 from elephantbox.boxes.component.Abstract import RectangularTuckBox
@@ -20,8 +19,11 @@ from elephantbox.support.Argumentable import akw
 from elephantbox.support.Argumentable import AKW_TYPE
 from elephantbox.support.Argumentable import Argumentable
 from elephantbox.support.Argumentable import fl_akw
+from elephantbox.support.CompactPath import CompactPath
 from elephantbox.support.Laserable import Gridable
 from elephantbox.support.Laserable import SpanableList
+from elephantbox.support.PathTemplate import templated_path
+from elephantbox.support.Validatable import Validatable
 
 
 @dataclass(frozen=True)
@@ -59,6 +61,9 @@ class WatchBox(
             akw("--show-guides", action="store_true"),
         ]
 
+    def parts(self) -> list[Validatable]:
+        return super().parts() + [self.CircleLock]
+
     @property
     def CircleLock(self):
         return CicleLock(
@@ -244,14 +249,22 @@ class WatchBox(
         grp.append(flaps)
         return grp
 
-    def cut_outline(self) -> Group:
-        grp = Group()
+    def outline_branches(self) -> tuple[bool, ...]:
+        return (self.width <= self.height,)
+
+    def outline_paths(self) -> list[CompactPath]:
+        return [
+            templated_path(
+                self, type(self).outline_path, type(self).outline_branches
+            )
+        ]
 
+    def outline_path(self) -> CompactPath:
         flap_thick = self.flap_thick
 
         flap_half = flap_thick / 2
 
-        cut_path = Path(**BODY_CUT_KWARGS)
+        cut_path = CompactPath(**BODY_CUT_KWARGS)
         cut_path.M(
             self.vertical_rails[0],
             self.horizontal_rails[1],
@@ -315,9 +328,7 @@ class WatchBox(
             flap_half
         ).Z()
 
-        grp.append(cut_path)
-
-        return grp
+        return cut_path
 
     def inner_cuts(self) -> Group:
         grp = Group(
@@ -6,6 +6,7 @@ from elephantbox.boxes.assembly.Finger import FivePanelFingerBox
 from elephantbox.boxes.tuck.Elephant import ElephantBox
 from elephantbox.boxes.tuck.Watch import WatchBox
 from elephantbox.math.Geometry import Point
+from elephantbox.support.cli import batch_maker
 from elephantbox.support.cli import main_maker
 
 
@@ -18,3 +19,13 @@ CompactTallFivePanelFingerBoxMain = main_maker(
 CompactWideFivePanelFingerBoxMain = main_maker(
     CompactWideFivePanelFingerBox, origin=Point(-6, -6)
 )
+
+BatchMain = batch_maker(
+    {
+        "elephantbox": ElephantBox,
+        "watchbox": WatchBox,
+        "fivepanelfingerbox": FivePanelFingerBox,
+        "compacttallfivepanelfingerbox": CompactTallFivePanelFingerBox,
+        "compactwidefivepanelfingerbox": CompactWideFivePanelFingerBox,
+    }
+)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Iterator
+from math import degrees
+from math import hypot
+from math import pi
+from math import tan
+from typing import TextIO
+
+from elephantbox.boxes.component.Defaults import LAYER_KWARGS
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Arc
+from elephantbox.math.Geometry import Segment
+from elephantbox.math.Transform import Affine
+
+
+# end points closer than this, after the transform, close a polyline
+CLOSE_TOLERANCE = 1e-6
+
+# AutoCAD colour index for each Defaults stroke colour
+STROKE_COLORS = {
+    "black": 7,
+    "blue": 5,
+    "red": 1,
+}
+
+
+def layer_name(layer: str) -> str:
+    return layer.upper() or "0"
+
+
+def pairs(*items) -> Iterator[str]:
+    """Group code and value lines for alternating (code, value) items."""
+    for index in range(0, len(items), 2):
+        yield f"{items[index]:>3}"
+        value = items[index + 1]
+        yield f"{value:.6f}" if isinstance(value, float) else str(value)
+
+
+def layer_table() -> Iterator[str]:
+    yield from pairs(0, "SECTION", 2, "TABLES")
+    # the one line type every layer uses
+    yield from pairs(0, "TABLE", 2, "LTYPE", 70, 1)
+    yield from pairs(0, "LTYPE", 2, "CONTINUOUS", 70, 0, 3, "Solid line")
+    yield from pairs(72, 65, 73, 0, 40, 0.0)
+    yield from pairs(0, "ENDTAB")
+    yield from pairs(0, "TABLE", 2, "LAYER", 70, len(LAYER_KWARGS))
+    for layer, kwargs in LAYER_KWARGS.items():
+        yield from pairs(0, "LAYER", 2, layer_name(layer), 70, 0)
+        yield from pairs(62, STROKE_COLORS.get(kwargs.get("stroke"), 7))
+        yield from pairs(6, "CONTINUOUS")
+    yield from pairs(0, "ENDTAB", 0, "ENDSEC")
+
+
+def split_arc(arc: Arc) -> list[Arc]:
+    """Halve arcs over a half turn, which one polyline bulge cannot hold."""
+    if abs(arc.sweep) <= pi:
+        return [arc]
+    half = arc.sweep / 2
+    return [
+        Arc(arc.center, arc.radius, arc.start_angle, half),
+        Arc(arc.center, arc.radius, arc.start_angle + half, half),
+    ]
+
+
+def arc_entity(arc: Arc, layer: str) -> Iterator[str]:
+    # DXF arcs always run counter-clockwise from start to end angle
+    start, end = arc.start_angle, arc.end_angle
+    if arc.sweep < 0:
+        start, end = end, start
+    yield from pairs(0, "ARC", 8, layer)
+    yield from pairs(10, float(arc.center.x), 20, float(arc.center.y))
+    yield from pairs(40, float(arc.radius))
+    yield from pairs(50, degrees(start) % 360, 51, degrees(end) % 360)
+
+
+def polyline_entity(contour: Contour, layer: str) -> Iterator[str]:
+    primitives = [
+        piece
+        for p in contour.primitives
+        for piece in (split_arc(p) if isinstance(p, Arc) else [p])
+    ]
+    gap = contour.end - contour.start
+    closed = contour.closed or hypot(gap.x, gap.y) <= CLOSE_TOLERANCE
+    yield from pairs(0, "POLYLINE", 8, layer, 66, 1)
+    yield from pairs(10, 0.0, 20, 0.0, 30, 0.0, 70, int(closed))
+    for primitive in primitives:
+        yield from pairs(0, "VERTEX", 8, layer)
+        yield from pairs(
+            10, float(primitive.start.x), 20, float(primitive.start.y), 30, 0.0
+        )
+        if isinstance(primitive, Arc):
+            yield from pairs(42, tan(primitive.sweep / 4))
+    if not closed:
+        yield from pairs(0, "VERTEX", 8, layer)
+        yield from pairs(
+            10, float(contour.end.x), 20, float(contour.end.y), 30, 0.0
+        )
+    yield from pairs(0, "SEQEND", 8, layer)
+
+
+def dxf_lines(
+    contours: Iterable[Contour], transform: Affine = Affine()
+) -> Iterator[str]:
+    """An R12 DXF drawing, one line at a time, with a layer per Defaults style.
+
+    Lone segments become LINE and lone arcs ARC entities; longer contours
+    become one POLYLINE each, with arcs kept exact as vertex bulges. R12
+    has no units header, so the units are whatever `transform` maps to.
+    """
+    yield from pairs(0, "SECTION", 2, "HEADER")
+    yield from pairs(9, "$ACADVER", 1, "AC1009")
+    yield from pairs(0, "ENDSEC")
+    yield from layer_table()
+
+    yield from pairs(0, "SECTION", 2, "ENTITIES")
+    for contour in contours:
+        contour = contour.transformed(transform)
+        layer = layer_name(contour.layer)
+        if 1 < len(contour.primitives):
+            yield from polyline_entity(contour, layer)
+        elif isinstance(contour.primitives[0], Segment):
+            start, end = contour.start, contour.end
+            yield from pairs(0, "LINE", 8, layer)
+            yield from pairs(10, float(start.x), 20, float(start.y))
+            yield from pairs(11, float(end.x), 21, float(end.y))
+        else:
+            yield from arc_entity(contour.primitives[0], layer)
+    yield from pairs(0, "ENDSEC", 0, "EOF")
+
+
+def write_dxf(
+    output: TextIO, contours: Iterable[Contour], transform: Affine = Affine()
+):
+    for line in dxf_lines(contours, transform):
+        output.write(line)
+        output.write("\n")
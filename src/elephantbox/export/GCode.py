@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TextIO
+
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Arc
+from elephantbox.math.Geometry import Bounds
+from elephantbox.math.Transform import Affine
+
+
+@dataclass(frozen=True)
+class LayerSettings:
+    """Feed in mm/min and spindle power (`S` word) for one cut layer."""
+
+    feed: float
+    power: float
+    passes: int = 1
+
+
+DEFAULT_LAYER_SETTINGS = {
+    "body_cut": LayerSettings(600, 1000),
+    "finger_cut": LayerSettings(600, 1000),
+    "tab_cut": LayerSettings(600, 1000),
+    "slot_cut": LayerSettings(600, 1000),
+    "fold": LayerSettings(1200, 300),
+}
+
+
+def machine_transform(bed: Bounds, dpi: float) -> Affine:
+    """Map drawing pixels onto a bed in millimetres with y pointing up."""
+    mm = 25.4 / dpi
+    return (
+        Affine.translation(0, bed.height * mm)
+        @ Affine.scaling(mm, -mm)
+        @ Affine.translation(-bed.left, -bed.top)
+    )
+
+
+def gcode_lines(
+    contours: Iterable[Contour],
+    settings: dict[str, LayerSettings] = DEFAULT_LAYER_SETTINGS,
+    transform: Affine = Affine(),
+) -> Iterator[str]:
+    """G-code for GRBL lasers, one line at a time, contour by contour.
+
+    Uses dynamic laser mode (`M4`), so power is off during every `G0`
+    rapid. Feed and power are only restated when the layer changes, and
+    arcs become `G2`/`G3` moves with centre offsets.
+    """
+    yield "G21"
+    yield "G90"
+    yield "M4 S0"
+
+    active = None
+    for contour in contours:
+        layer = settings.get(contour.layer, DEFAULT_LAYER_SETTINGS["body_cut"])
+        if layer != active:
+            yield f"F{layer.feed:g} S{layer.power:g}"
+            active = layer
+
+        contour = contour.transformed(transform)
+        yield f"G0 X{contour.start.x:.3f} Y{contour.start.y:.3f}"
+        for _ in range(layer.passes):
+            for primitive in contour.primitives:
+                end = primitive.end
+                if isinstance(primitive, Arc):
+                    offset = primitive.center - primitive.start
+                    yield (
+                        f"{'G3' if 0 < primitive.sweep else 'G2'}"
+                        f" X{end.x:.3f} Y{end.y:.3f}"
+                        f" I{offset.x:.3f} J{offset.y:.3f}"
+                    )
+                else:
+                    yield f"G1 X{end.x:.3f} Y{end.y:.3f}"
+            if 1 < layer.passes and contour.end != contour.start:
+                yield f"G0 X{contour.start.x:.3f} Y{contour.start.y:.3f}"
+
+    yield "M5"
+    yield "G0 X0 Y0"
+
+
+def write_gcode(
+    output: TextIO,
+    contours: Iterable[Contour],
+    settings: dict[str, LayerSettings] = DEFAULT_LAYER_SETTINGS,
+    transform: Affine = Affine(),
+):
+    for line in gcode_lines(contours, settings, transform):
+        output.write(line)
+        output.write("\n")
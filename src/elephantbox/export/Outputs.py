@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+
+import drawsvg
+
+from elephantbox.export.Dxf import write_dxf
+from elephantbox.export.GCode import DEFAULT_LAYER_SETTINGS
+from elephantbox.export.GCode import LayerSettings
+from elephantbox.export.GCode import machine_transform
+from elephantbox.export.GCode import write_gcode
+from elephantbox.export.Png import RasterSettings
+from elephantbox.export.Png import write_png
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Bounds
+
+
+@dataclass(frozen=True)
+class Build:
+    """Everything the output backends need, built once per bed."""
+
+    name: str
+    drawing: drawsvg.Drawing
+    contours: list[Contour]
+    bed: Bounds
+    dpi: float
+    settings: dict[str, LayerSettings] = field(
+        default_factory=lambda: dict(DEFAULT_LAYER_SETTINGS)
+    )
+    raster: RasterSettings = RasterSettings()
+
+
+def save_svg(build: Build) -> str:
+    path = f"{build.name}.svg"
+    build.drawing.save_svg(path)
+    return path
+
+
+def save_gcode(build: Build) -> str:
+    path = f"{build.name}.gcode"
+    with open(path, "w") as f:
+        write_gcode(
+            f,
+            build.contours,
+            build.settings,
+            machine_transform(build.bed, build.dpi),
+        )
+    return path
+
+
+def save_dxf(build: Build) -> str:
+    path = f"{build.name}.dxf"
+    with open(path, "w") as f:
+        write_dxf(f, build.contours, machine_transform(build.bed, build.dpi))
+    return path
+
+
+def save_png(build: Build) -> str:
+    path = f"{build.name}.png"
+    write_png(path, build.drawing, build.raster.dpi / build.dpi, build.raster)
+    return path
+
+
+WRITERS: dict[str, Callable[[Build], str]] = {
+    "svg": save_svg,
+    "gcode": save_gcode,
+    "dxf": save_dxf,
+    "png": save_png,
+}
+
+
+def save_build(
+    build: Build, formats: Sequence[str], threads: int = 1
+) -> list[str]:
+    """Write `build` in every format, returning the paths written.
+
+    Backends only read the build, so with `threads` above one they run side
+    by side in a thread pool; the first failure is raised once all finish.
+    """
+    writers = [WRITERS[f] for f in dict.fromkeys(formats)]
+    if threads <= 1 or len(writers) <= 1:
+        return [write(build) for write in writers]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(write, build) for write in writers]
+    return [future.result() for future in futures]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from math import ceil
+
+import drawsvg
+import numpy as np
+
+from elephantbox.math.Geometry import Bounds
+
+
+ROOT_SIZE_ATTRIBUTES = re.compile(
+    r'\s(?:width|height|viewBox|preserveAspectRatio)="[^"]*"'
+)
+
+
+@dataclass(frozen=True)
+class RasterSettings:
+    dpi: float = 96
+    tile_size: int = 2048
+    threads: int = 1
+    preview: bool = False
+    preview_size: int = 256
+
+
+def view_box(drawing: drawsvg.Drawing) -> Bounds:
+    x, y, w, h = (
+        float(v)
+        for v in str(drawing.svg_args["viewBox"]).replace(",", " ").split()
+    )
+    return Bounds(x, y, x + w, y + h)
+
+
+def framed(svg: str, view: Bounds, width: int, height: int) -> str:
+    """The document with its root resized to show `view` at this pixel size."""
+    start = svg.index("<svg")
+    end = svg.index(">", start)
+    root = ROOT_SIZE_ATTRIBUTES.sub("", svg[start:end])
+    return (
+        f"{svg[:start]}{root}"
+        f' width="{width}" height="{height}"'
+        f' viewBox="{view.left} {view.top} {view.width} {view.height}"'
+        f' preserveAspectRatio="none"{svg[end:]}'
+    )
+
+
+def render(svg: str, view: Bounds, width: int, height: int) -> np.ndarray:
+    import cairosvg
+    import imageio.v3 as iio
+
+    png = cairosvg.svg2png(
+        bytestring=framed(svg, view, width, height).encode(),
+        output_width=width,
+        output_height=height,
+    )
+    return iio.imread(png)
+
+
+def rasterize(
+    drawing: drawsvg.Drawing, scale: float, settings: RasterSettings
+) -> np.ndarray:
+    """Render the drawing to an RGBA array, `scale` pixels per drawing unit.
+
+    The document is serialized once. Large renders are cut into square
+    tiles that are rasterized separately, in a thread pool when asked, and
+    stitched into one array, so no single cairo surface grows past a tile.
+    """
+    svg = drawing.as_svg()
+    view = view_box(drawing)
+
+    if settings.preview:
+        scale = settings.preview_size / max(view.width, view.height)
+    width = max(1, ceil(view.width * scale))
+    height = max(1, ceil(view.height * scale))
+    if settings.preview:
+        return render(svg, view, width, height)
+
+    tile = settings.tile_size
+    tiles = [
+        (x, y, min(tile, width - x), min(tile, height - y))
+        for y in range(0, height, tile)
+        for x in range(0, width, tile)
+    ]
+
+    def render_tile(x: int, y: int, w: int, h: int) -> np.ndarray:
+        left = view.left + x / scale
+        top = view.top + y / scale
+        return render(
+            svg, Bounds(left, top, left + w / scale, top + h / scale), w, h
+        )
+
+    if settings.threads <= 1 or 1 == len(tiles):
+        images = [render_tile(*t) for t in tiles]
+    else:
+        with ThreadPoolExecutor(max_workers=settings.threads) as pool:
+            images = list(pool.map(lambda t: render_tile(*t), tiles))
+
+    canvas = np.zeros((height, width, 4), dtype=np.uint8)
+    for (x, y, w, h), image in zip(tiles, images):
+        rows, columns = slice(y, y + h), slice(x, x + w)
+        canvas[rows, columns, : image.shape[2]] = image
+        if image.shape[2] < 4:
+            canvas[rows, columns, 3] = 255
+    return canvas
+
+
+def write_png(
+    path: str,
+    drawing: drawsvg.Drawing,
+    scale: float,
+    settings: RasterSettings = RasterSettings(),
+):
+    import imageio.v3 as iio
+
+    iio.imwrite(path, rasterize(drawing, scale, settings))
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import replace
+from math import atan2
+from math import floor
+from math import pi
+
+from elephantbox.layout.Layers import CUT_ORDER
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Contour import Primitive
+from elephantbox.math.Geometry import Point
+from elephantbox.math.Geometry import Segment
+
+
+# outlines keep their edges; shorter or weaker cuts give way to them
+KEEP_ORDER = tuple(reversed(CUT_ORDER))
+
+ANGLE_STEP = 1e-3
+
+
+def direction(segment: Segment) -> Point:
+    # Segment.delta nudges vertical segments off true, so measure directly
+    vector = segment.end - segment.start
+    return vector * (1 / vector.length)
+
+
+class LineHash:
+    """Segments bucketed by the line they lie on: its angle and offset."""
+
+    def __init__(self, tolerance: float):
+        self.tolerance = tolerance
+        self.buckets: dict[tuple[int, int], list[Segment]] = defaultdict(list)
+        self.wrap = floor(pi / ANGLE_STEP)
+
+    def key(self, segment: Segment) -> tuple[int, int]:
+        d = direction(segment)
+        theta = atan2(d.y, d.x) % pi
+        n = Point(-d.y, d.x)
+        if theta != atan2(d.y, d.x):
+            n = n * -1
+        offset = n.x * segment.start.x + n.y * segment.start.y
+        return (
+            floor(theta / ANGLE_STEP) % self.wrap,
+            floor(offset / self.tolerance),
+        )
+
+    def add(self, segment: Segment):
+        self.buckets[self.key(segment)].append(segment)
+
+    def near(self, segment: Segment):
+        """Stored segments that may share a line with `segment`."""
+        a, c = self.key(segment)
+        for da in (-1, 0, 1):
+            angle = (a + da) % self.wrap
+            # lines crossing the angle wrap flip direction and offset sign
+            flip = a + da != angle
+            for dc in (-1, 0, 1):
+                offset = -(c + dc) - 1 if flip else c + dc
+                yield from self.buckets.get((angle, offset), [])
+
+
+def uncovered(
+    segment: Segment, others, tolerance: float
+) -> list[tuple[float, float]]:
+    """Stretches of `segment` (as distances from its start) no other covers."""
+    length = (segment.end - segment.start).length
+    d = direction(segment)
+    covered = []
+    for other in others:
+        ends = []
+        for p in (other.start, other.end):
+            v = p - segment.start
+            if tolerance < abs(d.x * v.y - d.y * v.x):
+                break
+            ends.append(d.x * v.x + d.y * v.y)
+        else:
+            low, high = max(min(ends), 0), min(max(ends), length)
+            if tolerance < high - low:
+                covered.append((low, high))
+
+    pieces = []
+    reached = 0.0
+    for low, high in sorted(covered):
+        if tolerance < low - reached:
+            pieces.append((reached, low))
+        reached = max(reached, high)
+    if tolerance < length - reached:
+        pieces.append((reached, length))
+    return pieces
+
+
+def merge_common_lines(
+    contours: Sequence[Contour], tolerance: float
+) -> tuple[list[Contour], float]:
+    """Cut every shared straight edge once, returning the length removed.
+
+    Segments are visited outlines first; any stretch of a segment lying
+    within `tolerance` of a segment already visited is dropped, splitting its
+    contour into open pieces around the gap.
+    """
+    rank = {layer: index for index, layer in enumerate(KEEP_ORDER)}
+    visiting = sorted(
+        range(len(contours)),
+        key=lambda i: rank.get(contours[i].layer, len(rank)),
+    )
+
+    lines = LineHash(tolerance)
+    kept: dict[tuple[int, int], list[tuple[float, float]]] = {}
+    removed = 0.0
+    for i in visiting:
+        for j, primitive in enumerate(contours[i].primitives):
+            if not isinstance(primitive, Segment):
+                continue
+            length = (primitive.end - primitive.start).length
+            # slivers have no line to share, and cutting them costs nothing
+            if length <= tolerance:
+                continue
+            pieces = uncovered(primitive, lines.near(primitive), tolerance)
+            lines.add(primitive)
+            if pieces != [(0.0, length)]:
+                kept[i, j] = pieces
+                removed += length - sum(b - a for a, b in pieces)
+
+    merged = []
+    for i, contour in enumerate(contours):
+        if any((i, j) in kept for j in range(len(contour.primitives))):
+            merged.extend(split_contour(contour, i, kept))
+        else:
+            merged.append(contour)
+    return merged, removed
+
+
+def split_contour(
+    contour: Contour,
+    index: int,
+    kept: dict[tuple[int, int], list[tuple[float, float]]],
+) -> list[Contour]:
+    runs: list[list[Primitive]] = [[]]
+    for j, primitive in enumerate(contour.primitives):
+        if (index, j) not in kept:
+            runs[-1].append(primitive)
+            continue
+        length = (primitive.end - primitive.start).length
+        d = direction(primitive)
+        reached = 0.0
+        for low, high in kept[index, j]:
+            if 0 < low or 0 < reached:
+                runs.append([])
+            runs[-1].append(
+                Segment(primitive.start + d * low, primitive.start + d * high)
+            )
+            reached = high
+        if reached < length:
+            runs.append([])
+
+    runs = [run for run in runs if run]
+    # a loop cut open keeps its piece across the old start point whole
+    if contour.closed and 1 < len(runs):
+        joins = (runs[-1][-1].end - runs[0][0].start).length <= 1e-9
+        if joins and runs[0][0].start == contour.start:
+            runs[0] = runs.pop() + runs[0]
+    return [
+        replace(contour, primitives=tuple(run), closed=False) for run in runs
+    ]
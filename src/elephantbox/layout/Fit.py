@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Bounds
+from elephantbox.math.Geometry import Point
+from elephantbox.math.Hull import caliper_angles
+from elephantbox.math.Hull import contour_points
+from elephantbox.math.Hull import convex_hull
+from elephantbox.math.Hull import rotated_extents
+
+
+@dataclass(frozen=True)
+class RotationFit:
+    angle: float
+    bounds: Bounds
+    fits: bool
+
+    @property
+    def report(self) -> str:
+        verdict = "fits" if self.fits else "does not fit"
+        return (
+            f"{self.angle:.2f} degrees,"
+            f" {self.bounds.width:.4g} x {self.bounds.height:.4g}, {verdict}"
+        )
+
+
+class RotationSolver:
+    """Finds good rotations for a set of contours from their convex hull.
+
+    The hull is built once; every query after that is a vectorized sweep
+    over candidate angles, cheap enough to run for each job in a sweep.
+    """
+
+    def __init__(self, contours: Sequence[Contour], tolerance: float = 0.01):
+        self.hull = convex_hull(contour_points(contours, tolerance))
+
+    def _result(
+        self, angles: np.ndarray, index: int, mins, maxs, fits: bool
+    ) -> RotationFit:
+        return RotationFit(
+            float(angles[index]),
+            Bounds(*mins[index], *maxs[index]),
+            fits,
+        )
+
+    def min_area(self) -> RotationFit:
+        """Rotation with the smallest bounding rectangle, by rotating calipers."""
+        angles = np.concatenate([[0.0], caliper_angles(self.hull)])
+        mins, maxs = rotated_extents(self.hull, angles)
+        size = maxs - mins
+        index = int(np.argmin(size[:, 0] * size[:, 1]))
+        return self._result(angles, index, mins, maxs, True)
+
+    def fit(self, bed: Point, step: float = 0.1) -> RotationFit:
+        """Smallest-area rotation that fits the bed.
+
+        Sweeps `step`-degree candidates over a half turn together with the
+        caliper angles. When nothing fits, the angle that overflows the bed
+        least is returned with `fits` False.
+        """
+        angles = np.concatenate(
+            [
+                np.arange(0, 180, step),
+                caliper_angles(self.hull),
+                caliper_angles(self.hull) + 90,
+            ]
+        )
+        mins, maxs = rotated_extents(self.hull, angles)
+        size = maxs - mins
+        slack = np.minimum(bed.x - size[:, 0], bed.y - size[:, 1])
+        if (0 <= slack).any():
+            area = np.where(0 <= slack, size[:, 0] * size[:, 1], np.inf)
+            index = int(np.argmin(area))
+        else:
+            index = int(np.argmax(slack))
+        return self._result(angles, index, mins, maxs, 0 <= slack[index])
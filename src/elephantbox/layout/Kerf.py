@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import replace
+from math import atan2
+from math import cos
+from math import hypot
+from math import pi
+from math import sin
+from math import sqrt
+
+from elephantbox.boxes.component.Defaults import FOLD_LAYERS
+from elephantbox.boxes.component.Defaults import OUTLINE_LAYERS
+from elephantbox.layout.Toolpath import is_loop
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Contour import Primitive
+from elephantbox.math.Geometry import Arc
+from elephantbox.math.Geometry import Point
+from elephantbox.math.Geometry import Segment
+
+
+def wrapped(angle: float) -> float:
+    """`angle` brought into (-pi, pi]."""
+    return angle - 2 * pi * round(angle / (2 * pi))
+
+
+def tangents(primitive: Primitive) -> tuple[Point, Point]:
+    """Unit directions of travel where the primitive starts and ends."""
+    if isinstance(primitive, Arc):
+        turn = 1 if 0 < primitive.sweep else -1
+        a, b = primitive.start_angle, primitive.end_angle
+        return (
+            Point(-sin(a) * turn, cos(a) * turn),
+            Point(-sin(b) * turn, cos(b) * turn),
+        )
+    dx = primitive.end.x - primitive.start.x
+    dy = primitive.end.y - primitive.start.y
+    length = hypot(dx, dy)
+    direction = Point(dx / length, dy / length)
+    return direction, direction
+
+
+def signed_area(contour: Contour) -> float:
+    """Shoelace area of a loop, with arcs counted exactly."""
+    area = 0.0
+    for p in contour.primitives:
+        a, b = p.start, p.end
+        area += a.x * b.y - b.x * a.y
+        if isinstance(p, Arc):
+            # the circular segment between the chord and the arc
+            area += p.radius**2 * (p.sweep - sin(p.sweep))
+    return area / 2
+
+
+def offset_primitive(primitive: Primitive, distance: float) -> Primitive | None:
+    """The primitive moved `distance` to the right of its direction of travel.
+
+    Arcs keep their center and change radius; an arc offset past its center
+    vanishes and None is returned.
+    """
+    if isinstance(primitive, Arc):
+        turn = 1 if 0 < primitive.sweep else -1
+        radius = primitive.radius + turn * distance
+        if radius <= 0:
+            return None
+        return replace(primitive, radius=radius)
+    direction, _ = tangents(primitive)
+    shift = Point(direction.y, -direction.x) * distance
+    return Segment(primitive.start + shift, primitive.end + shift)
+
+
+def carrier_crossings(a: Primitive, b: Primitive) -> list[Point]:
+    """Where the line or circle under `a` meets the one under `b`."""
+    if isinstance(a, Segment) and isinstance(b, Segment):
+        p, r = a.start, a.end - a.start
+        q, s = b.start, b.end - b.start
+        d = r.x * s.y - r.y * s.x
+        if 0 == d:
+            return []
+        t = ((q.x - p.x) * s.y - (q.y - p.y) * s.x) / d
+        return [p + r * t]
+
+    if isinstance(a, Arc) and isinstance(b, Arc):
+        c, e = a.center, b.center
+        gap = hypot(e.x - c.x, e.y - c.y)
+        if 0 == gap:
+            return []
+        along = (gap**2 + a.radius**2 - b.radius**2) / (2 * gap)
+        rise = a.radius**2 - along**2
+        if rise < 0:
+            return []
+        rise = sqrt(rise)
+        ux, uy = (e.x - c.x) / gap, (e.y - c.y) / gap
+        mid = Point(c.x + ux * along, c.y + uy * along)
+        return [
+            Point(mid.x - uy * rise, mid.y + ux * rise),
+            Point(mid.x + uy * rise, mid.y - ux * rise),
+        ]
+
+    line, arc = (a, b) if isinstance(a, Segment) else (b, a)
+    p, r = line.start, line.end - line.start
+    norm = hypot(r.x, r.y)
+    ux, uy = r.x / norm, r.y / norm
+    along = (arc.center.x - p.x) * ux + (arc.center.y - p.y) * uy
+    foot = Point(p.x + ux * along, p.y + uy * along)
+    rise = arc.radius**2 - (
+        (arc.center.x - foot.x) ** 2 + (arc.center.y - foot.y) ** 2
+    )
+    if rise < 0:
+        return []
+    rise = sqrt(rise)
+    return [
+        Point(foot.x - ux * rise, foot.y - uy * rise),
+        Point(foot.x + ux * rise, foot.y + uy * rise),
+    ]
+
+
+def with_end(primitive: Primitive, point: Point) -> Primitive:
+    if isinstance(primitive, Segment):
+        return Segment(primitive.start, point)
+    angle = atan2(point.y - primitive.center.y, point.x - primitive.center.x)
+    sweep = primitive.sweep + wrapped(angle - primitive.end_angle)
+    return replace(primitive, sweep=sweep)
+
+
+def with_start(primitive: Primitive, point: Point) -> Primitive:
+    if isinstance(primitive, Segment):
+        return Segment(point, primitive.end)
+    angle = atan2(point.y - primitive.center.y, point.x - primitive.center.x)
+    change = wrapped(angle - primitive.start_angle)
+    return replace(primitive, start_angle=angle, sweep=primitive.sweep - change)
+
+
+def joined(
+    before: Primitive, after: Primitive, vertex: Point, distance: float
+) -> tuple[Primitive, Primitive, Primitive | None]:
+    """Close the gap or overlap the offset opened at `vertex`.
+
+    A corner turning away from the offset side gets a round join about the
+    vertex; one turning toward it has both primitives trimmed back to where
+    they meet. The join, if any, comes back third.
+    """
+    a, b = before.end, after.start
+    if hypot(b.x - a.x, b.y - a.y) <= 1e-9:
+        return before, after, None
+
+    _, incoming = tangents(before)
+    outgoing, _ = tangents(after)
+    turn = incoming.x * outgoing.y - incoming.y * outgoing.x
+    if 0 < turn * distance:
+        start = atan2(a.y - vertex.y, a.x - vertex.x)
+        end = atan2(b.y - vertex.y, b.x - vertex.x)
+        join = Arc(vertex, abs(distance), start, wrapped(end - start))
+        return before, after, join
+
+    reach = 4 * abs(distance)
+    crossings = [
+        p
+        for p in carrier_crossings(before, after)
+        if hypot(p.x - vertex.x, p.y - vertex.y) <= reach
+    ]
+    if not crossings:
+        return before, after, Segment(a, b)
+    meet = min(crossings, key=lambda p: hypot(p.x - vertex.x, p.y - vertex.y))
+    return with_end(before, meet), with_start(after, meet), None
+
+
+def cleaned(
+    primitives: Sequence[Primitive], tolerance: float
+) -> list[Primitive]:
+    """A loop's primitives without the slivers no longer than `tolerance`.
+
+    Segments after a dropped sliver start where the kept loop left off.
+    """
+    kept = [p for p in primitives if tolerance < p.length]
+    for k, primitive in enumerate(kept):
+        if isinstance(primitive, Segment):
+            kept[k] = Segment(kept[k - 1].end, primitive.end)
+    return kept
+
+
+def offset_loop(
+    contour: Contour, distance: float, tolerance: float = 1e-3
+) -> Contour:
+    """A loop moved `distance` to the right of its direction of travel."""
+    pairs = [
+        (p.start, offset_primitive(p, distance))
+        for p in cleaned(contour.primitives, tolerance)
+    ]
+    pairs = [(v, p) for v, p in pairs if p is not None]
+    if not pairs:
+        return contour
+
+    vertices = [v for v, _ in pairs]
+    moved = [p for _, p in pairs]
+    joins: list[Primitive | None] = [None] * len(moved)
+    for k in range(len(moved)):
+        before = k - 1 if 0 < k else len(moved) - 1
+        moved[before], moved[k], joins[k] = joined(
+            moved[before], moved[k], vertices[k], distance
+        )
+
+    primitives = []
+    for join, primitive in zip(joins, moved):
+        if join is not None:
+            primitives.append(join)
+        primitives.append(primitive)
+    return replace(contour, primitives=tuple(primitives))
+
+
+def compensate_kerf(contours: Sequence[Contour], kerf: float) -> list[Contour]:
+    """Move every loop half a `kerf` out into the scrap it is cut from.
+
+    Outlines grow and the holes cut inside them shrink, so parts come out
+    at their drawn size. Open cuts and folds have stock on both sides and
+    are left alone.
+    """
+    compensated = []
+    for contour in contours:
+        if contour.layer in FOLD_LAYERS or not is_loop(contour):
+            compensated.append(contour)
+            continue
+        outward = 1 if 0 < signed_area(contour) else -1
+        grow = 1 if contour.layer in OUTLINE_LAYERS else -1
+        compensated.append(offset_loop(contour, outward * grow * kerf / 2))
+    return compensated
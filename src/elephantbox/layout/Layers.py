@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Arc
+from elephantbox.math.Geometry import Point
+
+
+# laser job order: perforations first, outlines that free the part last
+CUT_ORDER = ("fold", "slot_cut", "tab_cut", "finger_cut", "body_cut")
+
+
+def point_key(point: Point, digits: int) -> tuple[float, float]:
+    # adding zero folds the -0.0 left behind by rounding into 0.0
+    return (round(point.x, digits) + 0, round(point.y, digits) + 0)
+
+
+def contour_key(contour: Contour, digits: int = 4) -> tuple:
+    """Rounded geometry of a contour, the same for two copies of one cut."""
+    return (
+        contour.closed,
+        tuple(
+            (
+                point_key(p.start, digits),
+                point_key(p.end, digits),
+                point_key(p.center, digits) if isinstance(p, Arc) else None,
+            )
+            for p in contour.primitives
+        ),
+    )
+
+
+def dedupe(contours: Sequence[Contour], digits: int = 4) -> list[Contour]:
+    """Drop contours that repeat an earlier one, in either direction."""
+    seen = set()
+    unique = []
+    for contour in contours:
+        key = contour_key(contour, digits)
+        if key in seen:
+            continue
+        seen.add(key)
+        seen.add(contour_key(contour.reversed, digits))
+        unique.append(contour)
+    return unique
+
+
+def split_layers(
+    contours: Sequence[Contour], digits: int = 4
+) -> dict[str, list[Contour]]:
+    """Deduplicated contours of each layer, in laser job order.
+
+    Layers outside CUT_ORDER follow the known ones, in drawing order.
+    """
+    layers: dict[str, list[Contour]] = {layer: [] for layer in CUT_ORDER}
+    for contour in contours:
+        layers.setdefault(contour.layer, []).append(contour)
+    return {
+        layer: dedupe(members, digits)
+        for layer, members in layers.items()
+        if members
+    }
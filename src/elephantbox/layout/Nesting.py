@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from elephantbox.boxes.component.Defaults import OUTLINE_LAYERS
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Contour import contours_bounds
+from elephantbox.math.Contour import rotated_bounds
+from elephantbox.math.Geometry import Bounds
+from elephantbox.math.Geometry import Point
+from elephantbox.math.Transform import Affine
+
+
+DEFAULT_ANGLES = (0, 90, 45, -45)
+
+
+class NestingError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Part:
+    """One piece of stock: an outline plus every cut and fold inside it."""
+
+    contours: tuple[Contour, ...]
+    label: str = ""
+
+    @property
+    def bounds(self) -> Bounds:
+        return contours_bounds(list(self.contours))
+
+    def rotated_bounds(self, angle: float) -> Bounds:
+        return rotated_bounds(list(self.contours), angle)
+
+
+def split_parts(contours: Sequence[Contour], label: str = "") -> list[Part]:
+    """Group a drawing's contours into parts, one per outline contour.
+
+    Every other contour joins the smallest outline whose bounds hold its
+    center, or the nearest outline when none does.
+    """
+    outlines = [c for c in contours if c.layer in OUTLINE_LAYERS]
+    if not outlines:
+        return [Part(tuple(contours), label)] if contours else []
+
+    outline_bounds = [o.bounds for o in outlines]
+    members: list[list[Contour]] = [[o] for o in outlines]
+
+    for contour in contours:
+        if contour.layer in OUTLINE_LAYERS:
+            continue
+        center = contour.bounds.center
+        holding = [
+            i for i, b in enumerate(outline_bounds) if b.contains(center)
+        ]
+        if holding:
+            index = min(holding, key=lambda i: outline_bounds[i].area)
+        else:
+            index = min(
+                range(len(outlines)),
+                key=lambda i: (outline_bounds[i].center - center).length,
+            )
+        members[index].append(contour)
+
+    suffix = len(members) > 1
+    return [
+        Part(tuple(m), f"{label}#{n + 1}" if suffix else label)
+        for n, m in enumerate(members)
+    ]
+
+
+class MaxRectsBed:
+    """Free-space tracker for one bed, using the MaxRects heuristic."""
+
+    def __init__(self, width: float, height: float):
+        self.free = [Bounds(0, 0, width, height)]
+
+    def fit(self, width: float, height: float) -> tuple[float, Point] | None:
+        """Best short-side-fit score and position for a rectangle, if any."""
+        best = None
+        for rect in self.free:
+            if width <= rect.width and height <= rect.height:
+                score = min(rect.width - width, rect.height - height)
+                if best is None or score < best[0]:
+                    best = (score, rect.origin)
+        return best
+
+    def place(self, placed: Bounds):
+        free = []
+        for rect in self.free:
+            if not rect.intersects(placed):
+                free.append(rect)
+                continue
+            if rect.left < placed.left:
+                free.append(
+                    Bounds(rect.left, rect.top, placed.left, rect.bottom)
+                )
+            if placed.right < rect.right:
+                free.append(
+                    Bounds(placed.right, rect.top, rect.right, rect.bottom)
+                )
+            if rect.top < placed.top:
+                free.append(Bounds(rect.left, rect.top, rect.right, placed.top))
+            if placed.bottom < rect.bottom:
+                free.append(
+                    Bounds(rect.left, placed.bottom, rect.right, rect.bottom)
+                )
+        self.free = [
+            rect
+            for i, rect in enumerate(free)
+            if not any(
+                i != j and other.contains(rect) and (other != rect or j < i)
+                for j, other in enumerate(free)
+            )
+        ]
+
+
+@dataclass(frozen=True)
+class Placement:
+    part: Part
+    bed: int
+    angle: float
+    offset: Point
+
+    @property
+    def svg_transform(self) -> str:
+        return (
+            f"translate({self.offset.x} {self.offset.y}) rotate({self.angle})"
+        )
+
+    @property
+    def transform(self) -> Affine:
+        return Affine.translation(*self.offset.tuple) @ Affine.rotation(
+            self.angle
+        )
+
+    @property
+    def contours(self) -> list[Contour]:
+        return [c.transformed(self.transform) for c in self.part.contours]
+
+
+def nest(
+    parts: Sequence[Part],
+    bed: Point,
+    spacing: float = 0,
+    angles: Sequence[float] = DEFAULT_ANGLES,
+) -> list[Placement]:
+    """Pack parts onto as few beds as possible, largest first.
+
+    Each part is tried at every candidate angle against the free space of
+    each open bed, keeping `spacing` between neighbours and half of it to
+    every bed edge; a new bed is opened only when no open bed can take the
+    part.
+    """
+    sizes = {}
+    for part in parts:
+        for angle in angles:
+            sizes[id(part), angle] = part.rotated_bounds(angle)
+
+    def footprint(part: Part) -> float:
+        return min(sizes[id(part), a].area for a in angles)
+
+    beds: list[MaxRectsBed] = []
+    placements = []
+
+    for part in sorted(parts, key=footprint, reverse=True):
+        fits = [
+            a
+            for a in angles
+            if sizes[id(part), a].width + spacing <= bed.x
+            and sizes[id(part), a].height + spacing <= bed.y
+        ]
+        if not fits:
+            b = sizes[id(part), angles[0]]
+            raise NestingError(
+                f"Part {part.label or '?'} ({b.width:.4g} x {b.height:.4g})"
+                f" does not fit a {bed.x:.4g} x {bed.y:.4g} bed"
+            )
+
+        choice = None
+        for index, free in enumerate(beds):
+            for angle in fits:
+                size = sizes[id(part), angle].size + Point(spacing, spacing)
+                found = free.fit(*size.tuple)
+                if found is not None and (
+                    choice is None or found[0] < choice[0]
+                ):
+                    choice = (found[0], index, angle, found[1])
+            if choice is not None:
+                break
+
+        if choice is None:
+            beds.append(MaxRectsBed(bed.x, bed.y))
+            angle = min(fits, key=lambda a: sizes[id(part), a].area)
+            choice = (0, len(beds) - 1, angle, Point(0, 0))
+
+        _, index, angle, corner = choice
+        rotated = sizes[id(part), angle]
+        beds[index].place(
+            Bounds(
+                corner.x,
+                corner.y,
+                corner.x + rotated.width + spacing,
+                corner.y + rotated.height + spacing,
+            )
+        )
+        offset = corner + Point(spacing / 2, spacing / 2) - rotated.origin
+        placements.append(Placement(part, index, angle, offset))
+
+    return placements
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import replace
+from math import floor
+from math import hypot
+from math import inf
+from math import sqrt
+
+import numpy as np
+
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Point
+
+
+def travel_distance(
+    contours: Sequence[Contour], start: Point = Point(0, 0)
+) -> float:
+    """Length of the rapid moves between contours, cut in the given order."""
+    travel = 0.0
+    current = start
+    for contour in contours:
+        travel += (contour.start - current).length
+        current = contour.end
+    return travel
+
+
+def is_loop(contour: Contour, tolerance: float = 1e-6) -> bool:
+    """True for contours that end where they start, closed with `Z` or not."""
+    return contour.closed or (contour.end - contour.start).length <= tolerance
+
+
+def containers(contours: Sequence[Contour]) -> list[list[int]]:
+    """For each contour, the closed contours that must be cut after it.
+
+    A loop holds everything whose bounds fit inside its own, so cutting it
+    last keeps the material around inner cuts attached.
+    """
+    bounds = np.array(
+        [
+            (b.left, b.top, b.right, b.bottom)
+            for b in (c.bounds for c in contours)
+        ]
+    ).reshape(-1, 4)
+    area = (bounds[:, 2] - bounds[:, 0]) * (bounds[:, 3] - bounds[:, 1])
+
+    held: list[list[int]] = [[] for _ in contours]
+    for outer, contour in enumerate(contours):
+        if not is_loop(contour):
+            continue
+        inside = (
+            (bounds[outer, 0] <= bounds[:, 0])
+            & (bounds[outer, 1] <= bounds[:, 1])
+            & (bounds[:, 2] <= bounds[outer, 2])
+            & (bounds[:, 3] <= bounds[outer, 3])
+            & (area < area[outer])
+        )
+        for index in np.flatnonzero(inside).tolist():
+            held[index].append(outer)
+    return held
+
+
+class EntryGrid:
+    """Uniform grid of the points a contour can be entered from."""
+
+    def __init__(self, cell: float):
+        self.cell = cell
+        self.cells: dict[tuple[int, int], dict] = defaultdict(dict)
+        self.low = (inf, inf)
+        self.high = (-inf, -inf)
+
+    def key(self, point: Point) -> tuple[int, int]:
+        return (floor(point.x / self.cell), floor(point.y / self.cell))
+
+    def add(self, entry: tuple[int, int], point: Point):
+        key = self.key(point)
+        self.cells[key][entry] = point
+        self.low = (min(self.low[0], key[0]), min(self.low[1], key[1]))
+        self.high = (max(self.high[0], key[0]), max(self.high[1], key[1]))
+
+    def remove(self, entry: tuple[int, int], point: Point):
+        self.cells[self.key(point)].pop(entry, None)
+
+    def ring(self, cx: int, cy: int, r: int):
+        if 0 == r:
+            yield (cx, cy)
+            return
+        for x in range(cx - r, cx + r + 1):
+            yield (x, cy - r)
+            yield (x, cy + r)
+        for y in range(cy - r + 1, cy + r):
+            yield (cx - r, y)
+            yield (cx + r, y)
+
+    def nearest(self, point: Point) -> tuple[int, int] | None:
+        """Closest entry to `point`, searching outward ring by ring."""
+        cx, cy = self.key(point)
+        reach = max(
+            cx - self.low[0],
+            self.high[0] - cx,
+            cy - self.low[1],
+            self.high[1] - cy,
+        )
+        best, best_distance = None, inf
+        for r in range(max(reach, 0) + 1):
+            if (r - 1) * self.cell >= best_distance:
+                break
+            for key in self.ring(cx, cy, r):
+                for entry, p in self.cells.get(key, {}).items():
+                    distance = hypot(p.x - point.x, p.y - point.y)
+                    if distance < best_distance:
+                        best, best_distance = entry, distance
+        return best
+
+
+def nearest_neighbour(
+    contours: Sequence[Contour], start: Point = Point(0, 0)
+) -> list[Contour]:
+    """Greedy order that always cuts the closest contour it is allowed to.
+
+    Open contours may be entered from either end and loops from any vertex;
+    a loop becomes available only once everything inside it has been cut.
+    """
+    if not contours:
+        return []
+
+    held = containers(contours)
+    blocking = [0] * len(contours)
+    for outers in held:
+        for outer in outers:
+            blocking[outer] += 1
+
+    extent = [c.bounds for c in contours]
+    width = max(b.right for b in extent) - min(b.left for b in extent)
+    height = max(b.bottom for b in extent) - min(b.top for b in extent)
+    # cells hold about one contour each, even when the extent is a line
+    grid = EntryGrid(
+        max(
+            sqrt(width * height / len(contours)),
+            max(width, height) / len(contours),
+            1e-6,
+        )
+    )
+
+    # entry (index, k) starts at primitive k, and k of -1 cuts backwards
+    def entries(index: int):
+        contour = contours[index]
+        if is_loop(contour):
+            for k, primitive in enumerate(contour.primitives):
+                yield (index, k), primitive.start
+        else:
+            yield (index, 0), contour.start
+            yield (index, -1), contour.end
+
+    def entered(index: int, k: int) -> Contour:
+        contour = contours[index]
+        if -1 == k:
+            return contour.reversed
+        primitives = contour.primitives
+        return replace(contour, primitives=primitives[k:] + primitives[:k])
+
+    for index, count in enumerate(blocking):
+        if 0 == count:
+            for entry, point in entries(index):
+                grid.add(entry, point)
+
+    ordered = []
+    current = start
+    for _ in contours:
+        index, k = grid.nearest(current)
+        for entry, point in entries(index):
+            grid.remove(entry, point)
+        contour = entered(index, k)
+        ordered.append(contour)
+        current = contour.end
+        for outer in held[index]:
+            blocking[outer] -= 1
+            if 0 == blocking[outer]:
+                for entry, point in entries(outer):
+                    grid.add(entry, point)
+    return ordered
+
+
+def two_opt(
+    run: list[Contour],
+    before: Point,
+    after: Point | None,
+    passes: int = 4,
+) -> list[Contour]:
+    """Improve a run of freely orderable contours by 2-opt reversals.
+
+    Reversing a stretch of the run also reverses each contour in it, so the
+    rapid moves into and out of the stretch are the only costs that change;
+    those are evaluated for every stretch end at once.
+    """
+    run = list(run)
+    count = len(run)
+    if count < 2:
+        return run
+
+    starts = np.array([c.start.tuple for c in run])
+    ends = np.array([c.end.tuple for c in run])
+    for _ in range(passes):
+        improved = False
+        for i in range(count):
+            # moves run from `a` into stretch i..j and on to following[j - i]
+            a = np.array(before.tuple) if 0 == i else ends[i - 1]
+            following = np.vstack(
+                [
+                    starts[slice(i + 1, None)],
+                    [after.tuple if after else (np.nan, np.nan)],
+                ]
+            )
+            tail_ends = ends[i:]
+            old = np.hypot(*(starts[i] - a)) + np.nan_to_num(
+                np.hypot(*(following - tail_ends).T)
+            )
+            new = np.hypot(*(tail_ends - a).T) + np.nan_to_num(
+                np.hypot(*(following - starts[i]).T)
+            )
+            gain = old - new
+            best = int(np.argmax(gain))
+            if gain[best] <= 1e-9:
+                continue
+            stretch = slice(i, i + best + 1)
+            run[stretch] = [c.reversed for c in reversed(run[stretch])]
+            starts[stretch], ends[stretch] = (
+                ends[stretch][::-1].copy(),
+                starts[stretch][::-1].copy(),
+            )
+            improved = True
+        if not improved:
+            break
+    return run
+
+
+def order_contours(
+    contours: Sequence[Contour], start: Point = Point(0, 0)
+) -> list[Contour]:
+    """Cut order with short rapid moves and inner cuts before outer ones.
+
+    Builds a nearest-neighbour tour, then refines each stretch of contours
+    that hold nothing inside them with 2-opt. Contours that hold others stay
+    where the tour put them, so inside-before-outside is never broken.
+    """
+    ordered = nearest_neighbour(contours, start)
+    held = containers(ordered)
+    outers = {outer for outers in held for outer in outers}
+
+    result: list[Contour] = []
+    run: list[Contour] = []
+
+    def flush(after: Point | None):
+        before = result[-1].end if result else start
+        result.extend(two_opt(run, before, after))
+        run.clear()
+
+    for index, contour in enumerate(ordered):
+        if index in outers:
+            flush(contour.start)
+            result.append(contour)
+        else:
+            run.append(contour)
+    flush(None)
+    return result
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from math import atan2
+from typing import Self
+
+from elephantbox.math.Geometry import Arc
+from elephantbox.math.Geometry import Bounds
+from elephantbox.math.Geometry import Point
+from elephantbox.math.Geometry import Segment
+from elephantbox.math.Transform import Affine
+
+
+Primitive = Segment | Arc
+
+
+def transform_primitive(primitive: Primitive, transform: Affine) -> Primitive:
+    if isinstance(primitive, Segment):
+        return Segment(
+            transform.apply(primitive.start),
+            transform.apply(primitive.end),
+        )
+
+    if not transform.is_similarity:
+        raise ValueError("Arcs only survive rotation, translation and scale")
+    center = transform.apply(primitive.center)
+    start = transform.apply(primitive.start)
+    sweep = primitive.sweep if 0 < transform.determinant else -primitive.sweep
+    return Arc(
+        center,
+        primitive.radius * transform.scale,
+        atan2(start.y - center.y, start.x - center.x),
+        sweep,
+    )
+
+
+@dataclass(frozen=True)
+class Contour:
+    """One continuous stroke of cut geometry, in drawing coordinates.
+
+    `layer` names the Defaults style that drew it, and `style` keeps the
+    presentation attributes needed to draw it again.
+    """
+
+    primitives: tuple[Primitive, ...]
+    closed: bool = False
+    layer: str = ""
+    style: dict = field(default_factory=dict, compare=False)
+
+    @property
+    def start(self) -> Point:
+        return self.primitives[0].start
+
+    @property
+    def end(self) -> Point:
+        return self.primitives[-1].end
+
+    @property
+    def length(self) -> float:
+        return sum(p.length for p in self.primitives)
+
+    @property
+    def extreme_points(self) -> list[Point]:
+        return [pt for p in self.primitives for pt in p.extreme_points]
+
+    @property
+    def bounds(self) -> Bounds:
+        return Bounds.of_points(self.extreme_points)
+
+    @property
+    def reversed(self) -> Self:
+        return replace(
+            self,
+            primitives=tuple(p.reversed for p in reversed(self.primitives)),
+        )
+
+    def transformed(self, transform: Affine) -> Self:
+        if transform.is_identity:
+            return self
+        return replace(
+            self,
+            primitives=tuple(
+                transform_primitive(p, transform) for p in self.primitives
+            ),
+        )
+
+
+def contours_bounds(contours: list[Contour]) -> Bounds | None:
+    bounds = None
+    for contour in contours:
+        b = contour.bounds
+        bounds = b if bounds is None else bounds.union(b)
+    return bounds
+
+
+def rotated_bounds(contours: list[Contour], angle: float) -> Bounds | None:
+    """Exact bounds of the contours once rotated by `angle` degrees."""
+    rotation = Affine.rotation(angle)
+    return contours_bounds([c.transformed(rotation) for c in contours])
@@ -136,6 +136,201 @@ class Segment(VectorLike):
             self.end.y,
         )
 
+    @property
+    def extreme_points(self) -> list[Point]:
+        return [self.start, self.end]
+
+    @property
+    def bounds(self) -> Bounds:
+        return Bounds.of_points(self.extreme_points)
+
+    def point_at(self, fraction: float) -> Point:
+        return self.start + (self.end - self.start) * fraction
+
+
+@dataclass(frozen=True)
+class Bounds:
+    left: float
+    top: float
+    right: float
+    bottom: float
+
+    @classmethod
+    def of_points(cls, points: Sequence[Point]) -> Self:
+        xs = [p.x for p in points]
+        ys = [p.y for p in points]
+        return cls(min(xs), min(ys), max(xs), max(ys))
+
+    @property
+    def width(self) -> float:
+        return self.right - self.left
+
+    @property
+    def height(self) -> float:
+        return self.bottom - self.top
+
+    @property
+    def area(self) -> float:
+        return self.width * self.height
+
+    @property
+    def origin(self) -> Point:
+        return Point(self.left, self.top)
+
+    @property
+    def size(self) -> Point:
+        return Point(self.width, self.height)
+
+    @property
+    def center(self) -> Point:
+        return Point(
+            (self.left + self.right) / 2,
+            (self.top + self.bottom) / 2,
+        )
+
+    def union(self, other: Bounds) -> Self:
+        return type(self)(
+            min(self.left, other.left),
+            min(self.top, other.top),
+            max(self.right, other.right),
+            max(self.bottom, other.bottom),
+        )
+
+    def expanded(self, margin: float) -> Self:
+        return type(self)(
+            self.left - margin,
+            self.top - margin,
+            self.right + margin,
+            self.bottom + margin,
+        )
+
+    def contains(self, other: Bounds | Point) -> bool:
+        if isinstance(other, Point):
+            return (
+                self.left <= other.x <= self.right
+                and self.top <= other.y <= self.bottom
+            )
+        return (
+            self.left <= other.left
+            and self.top <= other.top
+            and other.right <= self.right
+            and other.bottom <= self.bottom
+        )
+
+    def intersects(self, other: Bounds) -> bool:
+        return (
+            self.left < other.right
+            and other.left < self.right
+            and self.top < other.bottom
+            and other.top < self.bottom
+        )
+
+
+@dataclass(frozen=True)
+class Arc(VectorLike):
+    """A circular arc, swept from `start_angle` by the signed `sweep`.
+
+    Angles are in radians and increase toward positive y, matching the SVG
+    sweep flag: a positive sweep is drawn with `sweep-flag` 1.
+    """
+
+    center: Point
+    radius: float
+    start_angle: float
+    sweep: float
+
+    @classmethod
+    def from_endpoints(
+        cls,
+        start: Point,
+        end: Point,
+        radius: float,
+        large_arc: bool,
+        sweep_flag: bool,
+    ) -> Self:
+        """Center parameterization of an SVG `A` command, as in SVG F.6.5."""
+        chord = end - start
+        half = chord.length / 2
+        if 0 == half:
+            return cls(start, 0, 0, 0)
+        radius = max(abs(radius), half)
+        mid = start + chord * 0.5
+
+        rise = sqrt(max(radius * radius - half * half, 0))
+        normal = Point(-chord.y, chord.x) * (1 / (2 * half))
+        if bool(large_arc) == bool(sweep_flag):
+            rise = -rise
+        center = mid + normal * rise
+
+        start_angle = atan2(start.y - center.y, start.x - center.x)
+        end_angle = atan2(end.y - center.y, end.x - center.x)
+        sweep = end_angle - start_angle
+        if sweep_flag and sweep < 0:
+            sweep += 2 * pi
+        elif not sweep_flag and 0 < sweep:
+            sweep -= 2 * pi
+
+        return cls(center, radius, start_angle, sweep)
+
+    @property
+    def end_angle(self) -> float:
+        return self.start_angle + self.sweep
+
+    @property
+    def start(self) -> Point:
+        return self.center + Point.polar(self.radius, self.start_angle)
+
+    @property
+    def end(self) -> Point:
+        return self.center + Point.polar(self.radius, self.end_angle)
+
+    @property
+    def angle(self) -> float:
+        return (self.end - self.start).angle
+
+    @property
+    def length(self) -> float:
+        return self.radius * abs(self.sweep)
+
+    @property
+    def large_arc(self) -> bool:
+        return pi < abs(self.sweep)
+
+    @property
+    def sweep_flag(self) -> bool:
+        return 0 < self.sweep
+
+    @property
+    def reversed(self) -> Self:
+        return type(self)(self.center, self.radius, self.end_angle, -self.sweep)
+
+    def covers_angle(self, angle: float) -> bool:
+        """True when the arc passes through the direction `angle`."""
+        if 0 <= self.sweep:
+            offset = (angle - self.start_angle) % (2 * pi)
+        else:
+            offset = (self.start_angle - angle) % (2 * pi)
+        return offset <= abs(self.sweep)
+
+    def point_at(self, fraction: float) -> Point:
+        return self.center + Point.polar(
+            self.radius, self.start_angle + self.sweep * fraction
+        )
+
+    @property
+    def extreme_points(self) -> list[Point]:
+        """End points plus every axis-extreme point the arc sweeps past."""
+        points = [self.start, self.end]
+        for quarter in range(4):
+            angle = quarter * pi / 2
+            if self.covers_angle(angle):
+                points.append(self.center + Point.polar(self.radius, angle))
+        return points
+
+    @property
+    def bounds(self) -> Bounds:
+        return Bounds.of_points(self.extreme_points)
+
 
 def rotated_size(p1: Point, p2: Point) -> float:
     dx = abs(p2.x - p1.x)
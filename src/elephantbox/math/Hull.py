@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from math import acos
+from math import ceil
+
+import numpy as np
+
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Arc
+
+
+def contour_points(
+    contours: Sequence[Contour], tolerance: float = 0.01
+) -> np.ndarray:
+    """Vertices of the contours as an (n, 2) array, arcs sampled so that no
+    chord strays more than `tolerance` inside the true curve."""
+    points = []
+    for contour in contours:
+        for primitive in contour.primitives:
+            points.append(primitive.start.tuple)
+            if isinstance(primitive, Arc) and primitive.radius > tolerance:
+                step = 2 * acos(1 - tolerance / primitive.radius)
+                count = ceil(abs(primitive.sweep) / step)
+                points.extend(
+                    primitive.point_at(i / count).tuple for i in range(1, count)
+                )
+            points.append(primitive.end.tuple)
+    return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """Counter-clockwise convex hull of an (n, 2) array, by monotone chain."""
+    points = np.unique(points, axis=0)
+    if len(points) < 3:
+        return points
+
+    def half(ordered: np.ndarray) -> list:
+        chain: list = []
+        for p in ordered.tolist():
+            while len(chain) >= 2:
+                (ax, ay), (bx, by) = chain[-2], chain[-1]
+                if (bx - ax) * (p[1] - ay) - (by - ay) * (p[0] - ax) > 0:
+                    break
+                chain.pop()
+            chain.append(p)
+        return chain
+
+    lower = half(points)
+    upper = half(points[::-1])
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def rotated_extents(
+    hull: np.ndarray, angles: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Bounds of the hull at every angle (degrees) in one vectorized step.
+
+    Returns (mins, maxs), each (len(angles), 2), using the same rotation
+    direction as an SVG `rotate()`.
+    """
+    theta = np.radians(np.asarray(angles, dtype=np.float64))[:, np.newaxis]
+    cos, sin = np.cos(theta), np.sin(theta)
+    xs = hull[:, 0] * cos - hull[:, 1] * sin
+    ys = hull[:, 0] * sin + hull[:, 1] * cos
+    mins = np.stack([xs.min(axis=1), ys.min(axis=1)], axis=1)
+    maxs = np.stack([xs.max(axis=1), ys.max(axis=1)], axis=1)
+    return mins, maxs
+
+
+def caliper_angles(hull: np.ndarray) -> np.ndarray:
+    """Rotations (degrees) that lay each hull edge flat along the x axis.
+
+    The minimum-area bounding rectangle always has a side on a hull edge,
+    so these are the only angles rotating calipers need to visit.
+    """
+    edges = np.roll(hull, -1, axis=0) - hull
+    return np.degrees(-np.arctan2(edges[:, 1], edges[:, 0])) % 90
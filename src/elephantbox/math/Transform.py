@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from math import atan2
+from math import cos
+from math import degrees
+from math import sin
+from math import sqrt
+from typing import Self
+
+import numpy as np
+
+from elephantbox.math.Geometry import deg2rad
+from elephantbox.math.Geometry import Point
+
+
+TRANSFORM_PATTERN = re.compile(r"(\w+)\s*\(([^)]*)\)")
+
+
+@dataclass(frozen=True)
+class Affine:
+    """An SVG `matrix(a b c d e f)`: x' = a x + c y + e, y' = b x + d y + f."""
+
+    a: float = 1
+    b: float = 0
+    c: float = 0
+    d: float = 1
+    e: float = 0
+    f: float = 0
+
+    @classmethod
+    def translation(cls, x: float, y: float) -> Self:
+        return cls(e=x, f=y)
+
+    @classmethod
+    def rotation(cls, degrees: float, cx: float = 0, cy: float = 0) -> Self:
+        theta = deg2rad(degrees)
+        rotate = cls(cos(theta), sin(theta), -sin(theta), cos(theta))
+        if cx or cy:
+            return cls.translation(cx, cy) @ rotate @ cls.translation(-cx, -cy)
+        return rotate
+
+    @classmethod
+    def scaling(cls, sx: float, sy: float | None = None) -> Self:
+        return cls(a=sx, d=sx if sy is None else sy)
+
+    def __matmul__(self, other: Affine) -> Self:
+        """Compose, applying `other` first and then `self`."""
+        return type(self)(
+            self.a * other.a + self.c * other.b,
+            self.b * other.a + self.d * other.b,
+            self.a * other.c + self.c * other.d,
+            self.b * other.c + self.d * other.d,
+            self.a * other.e + self.c * other.f + self.e,
+            self.b * other.e + self.d * other.f + self.f,
+        )
+
+    @property
+    def determinant(self) -> float:
+        return self.a * self.d - self.b * self.c
+
+    @property
+    def scale(self) -> float:
+        return sqrt(abs(self.determinant))
+
+    @property
+    def rotation_degrees(self) -> float:
+        return degrees(atan2(self.b, self.a))
+
+    @property
+    def is_identity(self) -> bool:
+        return self == type(self)()
+
+    @property
+    def is_similarity(self) -> bool:
+        """True when circles stay circles, so arcs can be mapped exactly."""
+        flip = -1 if self.determinant < 0 else 1
+        return np.isclose(self.a, flip * self.d) and np.isclose(
+            self.b, -flip * self.c
+        )
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return np.array([[self.a, self.c], [self.b, self.d]])
+
+    def apply(self, point: Point) -> Point:
+        return type(point)(
+            self.a * point.x + self.c * point.y + self.e,
+            self.b * point.x + self.d * point.y + self.f,
+        )
+
+    def apply_array(self, points: np.ndarray) -> np.ndarray:
+        """Map an (n, 2) array of points in one step."""
+        return points @ self.matrix.T + np.array([self.e, self.f])
+
+    @property
+    def svg(self) -> str:
+        return "matrix({} {} {} {} {} {})".format(
+            self.a, self.b, self.c, self.d, self.e, self.f
+        )
+
+
+def parse_transform(text: str | None) -> Affine:
+    """Parse an SVG transform attribute into a single Affine."""
+    transform = Affine()
+    if not text:
+        return transform
+
+    for name, args in TRANSFORM_PATTERN.findall(text):
+        values = [float(v) for v in re.split(r"[\s,]+", args.strip()) if v]
+        if "translate" == name:
+            step = Affine.translation(values[0], (values + [0])[1])
+        elif "rotate" == name:
+            step = Affine.rotation(*values[:3])
+        elif "scale" == name:
+            step = Affine.scaling(*values[:2])
+        elif "matrix" == name:
+            step = Affine(*values[:6])
+        else:
+            raise ValueError(f"Unsupported transform: {name}")
+        transform = transform @ step
+
+    return transform
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from collections.abc import Sequence
+from math import asin
+from math import atan2
+from math import hypot
+from math import pi
+
+import numpy as np
+from drawsvg import DrawingBasicElement
+from drawsvg import DrawingElement
+
+from elephantbox.math.Transform import Affine
+
+
+MOVE = 0
+LINE = 1
+ARC = 2
+CLOSE = 3
+
+# number of coordinates each command code consumes
+ARITY = np.array([2, 2, 7, 0])
+
+TEMPLATES = np.array(
+    [
+        "M%.12g,%.12g",
+        "L%.12g,%.12g",
+        "A%.12g,%.12g,%.12g,%d,%d,%.12g,%.12g",
+        "Z",
+    ],
+    dtype=object,
+)
+
+
+class CompactPath(DrawingBasicElement):
+    """A `path` element that keeps its commands as numbers.
+
+    Commands are stored absolute in a growable float buffer alongside a
+    command-code array, and only become `d` attribute text when the element
+    is written out, in a single formatting step.
+    """
+
+    TAG_NAME = "path"
+    precision = 4
+
+    def __init__(self, capacity: int = 64, **kwargs):
+        super().__init__(d="", **kwargs)
+        self.codes = np.empty(capacity, dtype=np.uint8)
+        self.coords = np.empty(capacity * 2, dtype=np.float64)
+        self.code_count = 0
+        self.coord_count = 0
+        self.current = (0.0, 0.0)
+        self.subpath_start = (0.0, 0.0)
+
+    def _reserve(self, code_count: int, coord_count: int):
+        needed = self.code_count + code_count
+        if len(self.codes) < needed:
+            grown = np.empty(max(needed, 2 * len(self.codes)), dtype=np.uint8)
+            grown[: self.code_count] = self.codes[: self.code_count]
+            self.codes = grown
+
+        needed = self.coord_count + coord_count
+        if len(self.coords) < needed:
+            grown = np.empty(max(needed, 2 * len(self.coords)))
+            grown[: self.coord_count] = self.coords[: self.coord_count]
+            self.coords = grown
+
+    def _push(self, code: int, *values: float):
+        self._reserve(1, len(values))
+        self.codes[self.code_count] = code
+        self.code_count += 1
+        start, end = self.coord_count, self.coord_count + len(values)
+        self.coords[start:end] = values
+        self.coord_count = end
+        return self
+
+    def M(self, x: float, y: float):
+        self.current = self.subpath_start = (x, y)
+        return self._push(MOVE, x, y)
+
+    def L(self, x: float, y: float):
+        self.current = (x, y)
+        return self._push(LINE, x, y)
+
+    def H(self, x: float):
+        return self.L(x, self.current[1])
+
+    def V(self, y: float):
+        return self.L(self.current[0], y)
+
+    def A(self, rx, ry, rot, large_arc, sweep, ex, ey):
+        self.current = (ex, ey)
+        return self._push(
+            ARC, rx, ry, rot, bool(large_arc), bool(sweep), ex, ey
+        )
+
+    def Z(self):
+        self.current = self.subpath_start
+        return self._push(CLOSE)
+
+    def m(self, dx: float, dy: float):
+        return self.M(self.current[0] + dx, self.current[1] + dy)
+
+    def l(self, dx: float, dy: float):  # noqa: E743
+        return self.L(self.current[0] + dx, self.current[1] + dy)
+
+    def h(self, dx: float):
+        return self.L(self.current[0] + dx, self.current[1])
+
+    def v(self, dy: float):
+        return self.L(self.current[0], self.current[1] + dy)
+
+    def a(self, rx, ry, rot, large_arc, sweep, dx, dy):
+        return self.A(
+            *(rx, ry, rot, large_arc, sweep),
+            *(self.current[0] + dx, self.current[1] + dy),
+        )
+
+    def extend_lines(self, points: np.ndarray):
+        """Append an `L` command for every row of an (n, 2) array."""
+        count = len(points)
+        if not count:
+            return self
+        self._reserve(count, 2 * count)
+        start, end = self.code_count, self.code_count + count
+        self.codes[start:end] = LINE
+        self.code_count = end
+        start, end = self.coord_count, self.coord_count + 2 * count
+        self.coords[start:end] = np.ravel(points)
+        self.coord_count = end
+        self.current = (float(points[-1][0]), float(points[-1][1]))
+        return self
+
+    def commands(self) -> Iterator[tuple[int, list[float]]]:
+        """Yield each command code with its absolute coordinates."""
+        offset = 0
+        coords = self.coords[: self.coord_count].tolist()
+        for code in self.codes[: self.code_count].tolist():
+            end = offset + int(ARITY[code])
+            yield code, coords[offset:end]
+            offset = end
+
+    def simplify(self, tolerance: float) -> int:
+        """Drop duplicate and collinear `L` vertices, in one pass.
+
+        A run of `L` commands becomes a single line from the last kept vertex
+        when every vertex dropped from the run lies within `tolerance` of
+        that line and the run never doubles back along it. Returns the number
+        of commands removed.
+        """
+        codes: list[int] = []
+        coords: list[float] = []
+
+        current = (0.0, 0.0)
+        subpath_start = current
+        anchor = (
+            None  # the kept vertex the last emitted, extendable L starts at
+        )
+        heading = 0.0  # direction from the anchor that angles are measured from
+        window = (-pi, pi)  # line directions keeping every dropped vertex close
+        reach = 0.0  # farthest dropped vertex from the anchor
+
+        for code, values in self.commands():
+            if LINE != code:
+                codes.append(code)
+                coords.extend(values)
+                anchor = None
+                if MOVE == code:
+                    current = subpath_start = (values[0], values[1])
+                elif ARC == code:
+                    current = (values[5], values[6])
+                else:
+                    current = subpath_start
+                continue
+
+            point = (values[0], values[1])
+            if hypot(point[0] - current[0], point[1] - current[1]) <= tolerance:
+                # a repeat still has to stay close if `current` is dropped
+                if anchor is not None:
+                    window = sleeve(window, anchor, point, heading, tolerance)
+                    reach = max(
+                        reach, hypot(point[0] - anchor[0], point[1] - anchor[1])
+                    )
+                continue
+
+            if anchor is not None:
+                # dropping `current` narrows the directions the line may take
+                low, high = sleeve(window, anchor, current, heading, tolerance)
+                dropped = hypot(current[0] - anchor[0], current[1] - anchor[1])
+                turn = wrapped(
+                    atan2(point[1] - anchor[1], point[0] - anchor[0]) - heading
+                )
+                distance = hypot(point[0] - anchor[0], point[1] - anchor[1])
+                if low <= turn <= high and max(reach, dropped) < distance:
+                    coords[-2:] = point
+                    window, reach = (low, high), max(reach, dropped)
+                    current = point
+                    continue
+
+            anchor = current
+            heading = atan2(point[1] - anchor[1], point[0] - anchor[0])
+            window, reach = (-pi, pi), 0.0
+            codes.append(LINE)
+            coords.extend(point)
+            current = point
+
+        removed = self.code_count - len(codes)
+        self.codes = np.array(codes, dtype=np.uint8)
+        self.coords = np.array(coords, dtype=np.float64)
+        self.code_count = len(codes)
+        self.coord_count = len(coords)
+        return removed
+
+    def transformed(self, transform: Affine) -> CompactPath:
+        """A copy with `transform` applied to every coordinate at once.
+
+        Points and arc end points are mapped together as one array; arc radii
+        scale with the transform and sweep flags flip under reflection.
+        """
+        return transform_paths([self], transform)[0]
+
+    @property
+    def d(self) -> str:
+        codes = self.codes[: self.code_count]
+        # adding zero folds the -0.0 left behind by rounding into 0.0
+        coords = np.round(self.coords[: self.coord_count], self.precision) + 0
+        return " ".join(TEMPLATES[codes]) % tuple(coords.tolist())
+
+    def write_svg_element(
+        self,
+        id_map,
+        is_duplicate,
+        output_file,
+        lcontext,
+        dry_run,
+        force_dup=False,
+    ):
+        if not dry_run:
+            self.args["d"] = self.d
+        return super().write_svg_element(
+            id_map, is_duplicate, output_file, lcontext, dry_run, force_dup
+        )
+
+
+def transform_paths(
+    paths: Sequence[CompactPath], transform: Affine
+) -> list[CompactPath]:
+    """Copies of `paths` with `transform` applied, all in one array pass."""
+    if not transform.is_similarity:
+        raise ValueError("Arcs only survive rotation, translation and scale")
+    if not paths:
+        return []
+
+    code_counts = [p.code_count for p in paths]
+    coord_counts = [p.coord_count for p in paths]
+    codes = np.concatenate([p.codes[: p.code_count] for p in paths])
+    coords = np.concatenate([p.coords[: p.coord_count] for p in paths])
+    arity = ARITY[codes]
+    offsets = np.cumsum(arity) - arity
+
+    arcs = offsets[ARC == codes]
+    xs = np.concatenate([offsets[(MOVE == codes) | (LINE == codes)], arcs + 5])
+    points = transform.apply_array(
+        np.stack([coords[xs], coords[xs + 1]], axis=1)
+    )
+    coords[xs] = points[:, 0]
+    coords[xs + 1] = points[:, 1]
+
+    coords[arcs] *= transform.scale
+    coords[arcs + 1] *= transform.scale
+    coords[arcs + 2] += transform.rotation_degrees
+    if transform.determinant < 0:
+        coords[arcs + 4] = 1 - coords[arcs + 4]
+
+    # each path's pen position and subpath start, mapped together
+    pens = transform.apply_array(
+        np.array([(*p.current, *p.subpath_start) for p in paths]).reshape(-1, 2)
+    ).reshape(-1, 4)
+
+    copies = []
+    pieces = zip(
+        paths,
+        np.split(codes, np.cumsum(code_counts)[:-1]),
+        np.split(coords, np.cumsum(coord_counts)[:-1]),
+        pens.tolist(),
+    )
+    for path, path_codes, path_coords, (x, y, sx, sy) in pieces:
+        copy = CompactPath(
+            capacity=1, **{k: v for k, v in path.args.items() if "d" != k}
+        )
+        copy.codes, copy.coords = path_codes, path_coords
+        copy.code_count, copy.coord_count = len(path_codes), len(path_coords)
+        copy.current, copy.subpath_start = (x, y), (sx, sy)
+        copies.append(copy)
+    return copies
+
+
+def wrapped(angle: float) -> float:
+    """`angle` brought into (-pi, pi]."""
+    return angle - 2 * pi * round(angle / (2 * pi))
+
+
+def sleeve(
+    window: tuple[float, float],
+    anchor: tuple[float, float],
+    vertex: tuple[float, float],
+    heading: float,
+    tolerance: float,
+) -> tuple[float, float]:
+    """`window` narrowed to the lines from `anchor` passing near `vertex`.
+
+    Directions are angles from `heading`; a vertex within `tolerance` of
+    the anchor leaves the window as it is.
+    """
+    distance = hypot(vertex[0] - anchor[0], vertex[1] - anchor[1])
+    if distance <= tolerance:
+        return window
+    half = asin(tolerance / distance)
+    center = wrapped(
+        atan2(vertex[1] - anchor[1], vertex[0] - anchor[0]) - heading
+    )
+    return max(window[0], center - half), min(window[1], center + half)
+
+
+def walk(element: DrawingElement) -> Iterator[DrawingElement]:
+    """Depth-first iteration over a drawsvg element tree."""
+    yield element
+    for child in getattr(element, "children", []):
+        yield from walk(child)
+
+
+def simplify_paths(element: DrawingElement, tolerance: float) -> int:
+    """Simplify every CompactPath under `element`, returning commands saved."""
+    return sum(
+        path.simplify(tolerance)
+        for path in walk(element)
+        if isinstance(path, CompactPath)
+    )
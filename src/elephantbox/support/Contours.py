@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from drawsvg import Circle
+from drawsvg import DrawingElement
+from drawsvg import Group
+from drawsvg import Rectangle
+from drawsvg import Use
+
+from elephantbox.boxes.component.Defaults import layer_of
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Contour import Primitive
+from elephantbox.math.Geometry import Arc
+from elephantbox.math.Geometry import Point
+from elephantbox.math.Geometry import Segment
+from elephantbox.math.Transform import Affine
+from elephantbox.math.Transform import parse_transform
+from elephantbox.support.CompactPath import ARC
+from elephantbox.support.CompactPath import CLOSE
+from elephantbox.support.CompactPath import CompactPath
+from elephantbox.support.CompactPath import LINE
+from elephantbox.support.CompactPath import MOVE
+from elephantbox.support.CompactPath import transform_paths
+
+
+INKSCAPE_NAMESPACE = "http://www.inkscape.org/namespaces/inkscape"
+
+# attributes that describe placement or identity rather than appearance
+NON_STYLE_ATTRIBUTES = (
+    "d",
+    "id",
+    "transform",
+    "x",
+    "y",
+    "xlink:href",
+    "overflow",
+)
+
+# attributes of a `use` that only say what to draw and where
+USE_ATTRIBUTES = ("xlink:href", "x", "y", "width", "height")
+
+
+def path_contours(path: CompactPath, layer: str, style: dict) -> list[Contour]:
+    """Split a CompactPath into one Contour per subpath."""
+    contours = []
+    primitives: list[Primitive] = []
+    current = start = Point(0, 0)
+
+    def flush(closed: bool = False):
+        if primitives:
+            contours.append(
+                Contour(tuple(primitives), closed, layer, dict(style))
+            )
+        primitives.clear()
+
+    for code, values in path.commands():
+        if MOVE == code:
+            flush()
+            current = start = Point(values[0], values[1])
+        elif LINE == code:
+            point = Point(values[0], values[1])
+            if point != current:
+                primitives.append(Segment(current, point))
+            current = point
+        elif ARC == code:
+            point = Point(values[5], values[6])
+            if point != current:
+                primitives.append(
+                    Arc.from_endpoints(
+                        current, point, values[0], values[3], values[4]
+                    )
+                )
+            current = point
+        elif CLOSE == code:
+            if current != start:
+                primitives.append(Segment(current, start))
+            flush(closed=True)
+            current = start
+    flush()
+
+    return contours
+
+
+def contours_of(
+    element: DrawingElement,
+    transform: Affine = Affine(),
+    style: dict | None = None,
+) -> list[Contour]:
+    """Cut and fold geometry under a drawsvg element, in its coordinates.
+
+    Group transforms are folded into the geometry numerically and styles are
+    inherited down the tree; only paths drawn with one of the Defaults layer
+    styles are kept, so guides and debug marks drop out.
+    """
+    args = getattr(element, "args", {})
+    style = dict(style or {})
+    style.update(
+        (k, v) for k, v in args.items() if k not in NON_STYLE_ATTRIBUTES
+    )
+    if "transform" in args:
+        transform = transform @ parse_transform(args["transform"])
+
+    contours = []
+    if isinstance(element, CompactPath):
+        layer = layer_of(style)
+        if layer is not None:
+            contours.extend(
+                path_contours(element.transformed(transform), layer, style)
+            )
+    elif isinstance(element, Use):
+        target = args["xlink:href"]
+        if isinstance(target, DrawingElement):
+            placed = transform @ Affine.translation(
+                float(args.get("x", 0)), float(args.get("y", 0))
+            )
+            for child in getattr(target, "children", []):
+                contours.extend(contours_of(child, placed, style))
+
+    for child in getattr(element, "children", []):
+        contours.extend(contours_of(child, transform, style))
+
+    return contours
+
+
+def flatten_transforms(element: DrawingElement) -> DrawingElement:
+    """A copy of the tree with every transform folded into its numbers.
+
+    Paths are collected with the transform they are drawn under and mapped
+    in one array pass per distinct transform, along with rectangles redrawn
+    as paths; `use` references are expanded in place and circles move their
+    centers. Anything else under a transform keeps a single `transform`
+    attribute of its own.
+    """
+    batches: dict[Affine, list[tuple[Group, int, CompactPath]]] = defaultdict(
+        list
+    )
+
+    def copy_into(parent: Group, child: DrawingElement, transform: Affine):
+        args = getattr(child, "args", {})
+        outer = transform
+        if "transform" in args:
+            transform = transform @ parse_transform(args["transform"])
+        kept = {k: v for k, v in args.items() if "transform" != k}
+
+        if isinstance(child, CompactPath):
+            batches[transform].append((parent, len(parent.children), child))
+            parent.append(child)
+        elif isinstance(child, Use) and isinstance(
+            args["xlink:href"], DrawingElement
+        ):
+            placed = transform @ Affine.translation(
+                float(args.get("x", 0)), float(args.get("y", 0))
+            )
+            grp = Group(
+                **{k: v for k, v in kept.items() if k not in USE_ATTRIBUTES}
+            )
+            parent.append(grp)
+            for target_child in args["xlink:href"].children:
+                copy_into(grp, target_child, placed)
+        elif isinstance(child, Group):
+            grp = Group(**kept)
+            parent.append(grp)
+            for grandchild in child.children:
+                copy_into(grp, grandchild, transform)
+        elif isinstance(child, Rectangle) and not transform.is_identity:
+            x, y = float(args["x"]), float(args["y"])
+            right = x + float(args["width"])
+            bottom = y + float(args["height"])
+            outline = CompactPath(
+                capacity=5,
+                **{
+                    k: v
+                    for k, v in kept.items()
+                    if k not in ("x", "y", "width", "height")
+                },
+            )
+            outline.M(x, y).L(right, y).L(right, bottom).L(x, bottom).Z()
+            batches[transform].append((parent, len(parent.children), outline))
+            parent.append(outline)
+        elif isinstance(child, Circle) and transform.is_similarity:
+            center = transform.apply(
+                Point(float(args["cx"]), float(args["cy"]))
+            )
+            parent.append(
+                Circle(
+                    center.x,
+                    center.y,
+                    float(args["r"]) * transform.scale,
+                    **{
+                        k: v
+                        for k, v in kept.items()
+                        if k not in ("cx", "cy", "r")
+                    },
+                )
+            )
+        elif outer.is_identity:
+            parent.append(child)
+        else:
+            wrapper = Group(transform=outer.svg)
+            wrapper.append(child)
+            parent.append(wrapper)
+
+    root = Group()
+    copy_into(root, element, Affine())
+    for transform, places in batches.items():
+        paths = transform_paths([path for _, _, path in places], transform)
+        for (parent, index, _), path in zip(places, paths):
+            path.args.pop("transform", None)
+            parent.children[index] = path
+    return root.children[0]
+
+
+def contour_path(contour: Contour) -> CompactPath:
+    path = CompactPath(**contour.style)
+    path.M(*contour.start.tuple)
+
+    primitives = list(contour.primitives)
+    if contour.closed and isinstance(primitives[-1], Segment):
+        primitives.pop()
+
+    for primitive in primitives:
+        if isinstance(primitive, Arc):
+            path.A(
+                *(primitive.radius, primitive.radius),
+                *(0, primitive.large_arc, primitive.sweep_flag),
+                *primitive.end.tuple,
+            )
+        else:
+            path.L(*primitive.end.tuple)
+
+    if contour.closed:
+        path.Z()
+    return path
+
+
+def draw_contours(contours: list[Contour], **kwargs) -> Group:
+    grp = Group(**kwargs)
+    for contour in contours:
+        grp.append(contour_path(contour))
+    return grp
+
+
+def draw_layers(layers: dict[str, list[Contour]]) -> list[Group]:
+    """A group per layer, marked as a layer for Inkscape and LightBurn.
+
+    The groups belong at the top of a drawing with `xmlns:inkscape` set to
+    INKSCAPE_NAMESPACE.
+    """
+    return [
+        draw_contours(
+            contours,
+            id=layer,
+            **{"inkscape:label": layer, "inkscape:groupmode": "layer"},
+        )
+        for layer, contours in layers.items()
+    ]
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 from drawsvg import Group
-from drawsvg import Line
 from drawsvg import Rectangle
 
 from elephantbox.boxes.component.Dash import Dasher
 from elephantbox.boxes.component.Defaults import DEBUG_OBJ_KWARGS
 from elephantbox.boxes.component.Defaults import FOLD_PERFERATION_KWARGS
+from elephantbox.boxes.component.Defaults import override
 from elephantbox.boxes.component.Defaults import SLOT_CUT_KWARGS
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Contour import contours_bounds
+from elephantbox.math.Contour import rotated_bounds
+from elephantbox.math.Geometry import Bounds
 from elephantbox.math.Geometry import Point
+from elephantbox.math.Geometry import Segment
+from elephantbox.math.Transform import Affine
+from elephantbox.support.CompactPath import CompactPath
+from elephantbox.support.Contours import contours_of
+from elephantbox.support.Contours import path_contours
 
 
 SpanableList = list[tuple[Point, Point]]
@@ -34,9 +43,10 @@ class InnerCutListable:
     def inner_cuts(self) -> Group:
         grp = Group()
         for p1, p2 in self.innerCutList():
-            foldLine = Line(
-                *(p1.x, p1.y, p2.x, p2.y),
-                **SLOT_CUT_KWARGS,
+            foldLine = (
+                CompactPath(capacity=2, **SLOT_CUT_KWARGS)
+                .M(p1.x, p1.y)
+                .L(p2.x, p2.y)
             )
             grp.append(foldLine)
 
@@ -49,10 +59,18 @@ class Laserable(FoldListable, InnerCutListable):
     def guides(self) -> Group:
         return Group()
 
+    def outline_paths(self) -> list[CompactPath]:
+        """The outline cut around the box; all else it cuts lies inside."""
+        return []
+
     def cut_outline(self) -> Group:
-        return Group()
+        grp = Group()
+        grp.extend(self.outline_paths())
+        return grp
 
     def draw(self, enable_guides: bool = False) -> Group:
+        # the drawing budget covers one drawing, however often a box is drawn
+        self.dasher.ledger.reset()
         grp = Group(
             transform=f"translate({self.laser_bed_origin.x} {self.laser_bed_origin.y})"
         )
@@ -63,6 +81,51 @@ class Laserable(FoldListable, InnerCutListable):
         grp.append(self.inner_cuts())
         return grp
 
+    def contours(self) -> list[Contour]:
+        return contours_of(self.draw())
+
+    def outline_contours(self) -> list[Contour]:
+        """The outline as Contours, placed where `draw` puts it."""
+        # measuring is not drawing, so it leaves the drawing budget alone
+        with self.dasher.ledger.apart():
+            paths = self.outline_paths()
+        shift = Affine.translation(*self.laser_bed_origin.tuple)
+        return [
+            contour.transformed(shift)
+            for path in paths
+            for contour in path_contours(path, "outline", {})
+        ]
+
+    def measured_contours(self) -> list[Contour]:
+        """Everything `draw` cuts or folds, placed where it puts it.
+
+        Fold lines count as the whole spans their dashes fill, so no fold is
+        dashed, and the dashes inner cuts need stay off the drawing budget.
+        """
+        with self.dasher.ledger.apart():
+            inner = contours_of(self.inner_cuts())
+        folds = [
+            Contour((Segment(start, end),), layer="fold")
+            for start, end in self.foldList()
+        ]
+        shift = Affine.translation(*self.laser_bed_origin.tuple)
+        return self.outline_contours() + [
+            contour.transformed(shift) for contour in inner + folds
+        ]
+
+    def bounds(self) -> Bounds | None:
+        """Exact axis-aligned bounds of everything `draw` would cut.
+
+        Only the outline and inner cuts are built, and fold lines are taken
+        whole, so measuring skips dashing the folds and spends none of the
+        drawing budget. None when the box draws nothing.
+        """
+        return contours_bounds(self.measured_contours())
+
+    def rotated_bounds(self, angle: float) -> Bounds | None:
+        """Exact axis-aligned bounds after rotating by `angle` degrees."""
+        return rotated_bounds(self.measured_contours(), angle)
+
 
 class Gridable(Laserable):
     @property
@@ -73,23 +136,48 @@ class Gridable(Laserable):
     def horizontal_rails(self) -> list[float]:
         return []
 
+    guide_cells: bool = False
+
     def guides(self) -> Group:
         grp = super().guides()
+        if self.guide_cells:
+            grp.append(self.guide_cell_rectangles())
+        else:
+            grp.append(self.guide_rail_path())
+        return grp
+
+    def guide_rail_path(self) -> Group:
+        grid = Group()
+        if not self.horizontal_rails or not self.vertical_rails:
+            return grid
+
+        left, right = min(self.vertical_rails), max(self.vertical_rails)
+        top, bottom = min(self.horizontal_rails), max(self.horizontal_rails)
+
+        grid.append(
+            Rectangle(
+                *(left, top),
+                *(right - left, bottom - top),
+                **override(DEBUG_OBJ_KWARGS, stroke="none"),
+            )
+        )
+
+        rails = CompactPath(**override(DEBUG_OBJ_KWARGS, fill="none"))
+        for h in self.horizontal_rails:
+            rails.M(left, h).H(right)
+        for v in self.vertical_rails:
+            rails.M(v, top).V(bottom)
+        grid.append(rails)
+
+        return grid
+
+    def guide_cell_rectangles(self) -> Group:
         grid = Group()
-        dots = Group()
 
         lhh = None
         for h in self.horizontal_rails:
             lhv = None
             for v in self.vertical_rails:
-                # dots.append(
-                #     Circle(
-                #         v,
-                #         h,
-                #         5,
-                #         **DEBUG_OBJ_KWARGS,
-                #     )
-                # )
                 if lhv is not None and lhh is not None:
                     grid.append(
                         Rectangle(
@@ -101,6 +189,4 @@ class Gridable(Laserable):
                 lhv = v
             lhh = h
 
-        grp.append(grid)
-        grp.append(dots)
-        return grp
+        return grid
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import copy
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from elephantbox.support.Argumentable import akw_dest
+from elephantbox.support.CompactPath import ARITY
+from elephantbox.support.CompactPath import CLOSE
+from elephantbox.support.CompactPath import CompactPath
+from elephantbox.support.CompactPath import MOVE
+
+
+# how far each dimension is moved to read off the slopes; any step gives the
+# same slopes as long as the outline stays on the same branches
+STEP = 1.0
+
+
+@dataclass(frozen=True)
+class PathTemplate:
+    """A CompactPath whose every coordinate is affine in a few dimensions.
+
+    Keeps the command codes, the coordinates traced at `origin` and the slope
+    of each coordinate along each dimension in `names`, so another size is a
+    single matrix product and a whole table of sizes is one more.
+    """
+
+    names: tuple[str, ...]
+    codes: np.ndarray
+    origin: np.ndarray
+    base: np.ndarray
+    slopes: np.ndarray
+    style: dict
+
+    def coordinates(self, values: np.ndarray) -> np.ndarray:
+        """Path coordinates for each row of dimension values, as `names`."""
+        return self.base + (np.atleast_2d(values) - self.origin) @ self.slopes.T
+
+    def path(self, coords: np.ndarray) -> CompactPath:
+        """The templated path drawn with one row of `coordinates`."""
+        path = CompactPath(capacity=1, **self.style)
+        path.codes, path.coords = self.codes.copy(), np.array(coords)
+        path.code_count, path.coord_count = len(path.codes), len(path.coords)
+
+        ends = np.cumsum(ARITY[self.codes])
+        moves = np.flatnonzero(MOVE == self.codes)
+        if len(moves):
+            x, y = path.coords[slice(ends[moves[-1]] - 2, ends[moves[-1]])]
+            path.subpath_start = (float(x), float(y))
+        if CLOSE == self.codes[-1]:
+            path.current = path.subpath_start
+        else:
+            path.current = (float(path.coords[-2]), float(path.coords[-1]))
+        return path
+
+    def paths(self, values: np.ndarray) -> list[CompactPath]:
+        return [self.path(row) for row in self.coordinates(values)]
+
+
+def dimension_names(box) -> tuple[str, ...]:
+    return tuple(
+        name
+        for name in dict.fromkeys(
+            akw_dest(a) for a in type(box).dimension_arguments()
+        )
+        if isinstance(getattr(box, name, None), (int, float))
+    )
+
+
+def resized(box, **dimensions):
+    """A copy of the frozen box with some dimensions changed, unvalidated."""
+    probe = copy.copy(box)
+    for name, value in dimensions.items():
+        object.__setattr__(probe, name, value)
+    return probe
+
+
+def compile_template(
+    box,
+    trace: Callable[[object], CompactPath],
+    branches: Callable[[object], tuple],
+) -> PathTemplate | None:
+    """Trace `box` once per dimension and read off each coordinate's slope.
+
+    Dimensions that cannot move without changing `branches` keep a slope of
+    zero. None is returned when the traced path turns out not to be affine
+    in its dimensions, so it has to be drawn directly.
+    """
+    names = dimension_names(box)
+    origin = np.array([getattr(box, n) for n in names], dtype=float)
+    key = branches(box)
+
+    def traced(probe) -> tuple[np.ndarray, np.ndarray]:
+        path = trace(probe)
+        return (
+            path.codes[: path.code_count].copy(),
+            path.coords[: path.coord_count].copy(),
+        )
+
+    first = trace(box)
+    codes = first.codes[: first.code_count].copy()
+    base = first.coords[: first.coord_count].copy()
+    slopes = np.zeros((len(base), len(names)))
+    moved = np.zeros(len(names))
+    for index, name in enumerate(names):
+        for step in (STEP, -STEP):
+            probe = resized(box, **{name: origin[index] + step})
+            if branches(probe) == key:
+                break
+        else:
+            continue
+        probe_codes, coords = traced(probe)
+        if not np.array_equal(codes, probe_codes):
+            return None
+        slopes[:, index] = (coords - base) / step
+        moved[index] = step
+
+    # moving every dimension at once must land where the slopes predict
+    probe = resized(
+        box, **{n: v for n, v in zip(names, (origin + moved / 2).tolist())}
+    )
+    if branches(probe) == key:
+        probe_codes, coords = traced(probe)
+        predicted = base + slopes @ (moved / 2)
+        if not np.array_equal(codes, probe_codes) or not np.allclose(
+            coords, predicted, rtol=0, atol=1e-6
+        ):
+            return None
+
+    style = {k: v for k, v in first.args.items() if "d" != k}
+    return PathTemplate(names, codes, origin, base, slopes, style)
+
+
+TEMPLATES: dict[tuple, PathTemplate | None] = {}
+
+
+def template_of(
+    box,
+    trace: Callable[[object], CompactPath],
+    branches: Callable[[object], tuple],
+) -> PathTemplate | None:
+    """The compiled template for `box`'s branches, compiling it if needed.
+
+    `trace` may depend on nothing but the box's dimensions, and only
+    through the branches `branches` names.
+    """
+    key = (type(box), trace.__qualname__, branches(box))
+    if key not in TEMPLATES:
+        TEMPLATES[key] = compile_template(box, trace, branches)
+    return TEMPLATES[key]
+
+
+def templated_path(
+    box,
+    trace: Callable[[object], CompactPath],
+    branches: Callable[[object], tuple],
+) -> CompactPath:
+    """`trace(box)`, evaluated from its compiled template when there is one."""
+    template = template_of(box, trace, branches)
+    if template is None:
+        return trace(box)
+    values = np.array([getattr(box, n) for n in template.names], dtype=float)
+    return template.paths(values)[0]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from drawsvg import DrawingElement
+from drawsvg import Use
+from drawsvg.defs import DrawingDef
+
+from elephantbox.support.CompactPath import CompactPath
+
+
+class Symbol(DrawingDef):
+    """A `symbol` def, drawn in the user space of each `use` referencing it."""
+
+    TAG_NAME = "symbol"
+
+    def __init__(self, **kwargs):
+        super().__init__(overflow="visible", **kwargs)
+
+
+def geometry_key(path: CompactPath) -> tuple:
+    return (
+        path.codes[: path.code_count].tobytes(),
+        path.coords[: path.coord_count].tobytes(),
+        tuple(sorted((k, str(v)) for k, v in path.args.items() if "d" != k)),
+    )
+
+
+def share_repeated_paths(element: DrawingElement) -> int:
+    """Move repeated identical paths into `symbol` defs, drawn with `use`.
+
+    Paths whose commands and attributes match exactly are stored once; every
+    copy is swapped in place for a `use` of the shared symbol, so transforms
+    on the enclosing groups still apply. Returns the number of paths that
+    were replaced.
+    """
+    occurrences: dict[tuple, list[tuple[DrawingElement, int]]] = defaultdict(
+        list
+    )
+
+    def collect(parent: DrawingElement):
+        for index, child in enumerate(getattr(parent, "children", [])):
+            if isinstance(child, CompactPath):
+                occurrences[geometry_key(child)].append((parent, index))
+            else:
+                collect(child)
+
+    collect(element)
+
+    replaced = 0
+    for places in occurrences.values():
+        if len(places) < 2:
+            continue
+        symbol = Symbol()
+        first_parent, first_index = places[0]
+        symbol.append(first_parent.children[first_index])
+        for parent, index in places:
+            parent.children[index] = Use(symbol, 0, 0)
+            replaced += 1
+    return replaced
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from pprint import pprint
+import numpy as np
 
 
 class Validatable:
@@ -16,8 +16,37 @@ class Validatable:
     def assertions(self) -> list[tuple[bool, str]]:
         return []
 
-    def __post_init__(self):
-        errors = self.validate()
-        if errors:
-            print("Failed Tests:")
-            pprint(errors)
+    def parts(self) -> list[Validatable]:
+        """The validatable objects this one is built from."""
+        return []
+
+    def failures(self) -> list[tuple[Validatable, str]]:
+        """Every failed assertion of this object and its parts, in order."""
+        failed = [(self, reason) for reason in self.validate()]
+        for part in self.parts():
+            failed.extend(part.failures())
+        return failed
+
+    @classmethod
+    def screen(cls, **parameters) -> tuple[np.ndarray, dict[str, int]]:
+        """Evaluate `assertions` over whole arrays of parameters at once.
+
+        Keywords name the attributes the assertions read and are broadcast
+        together; no instance is built. Returns the mask of passing
+        combinations and how many combinations each assertion fails.
+        """
+        arrays = np.broadcast_arrays(*map(np.asarray, parameters.values()))
+        probe = object.__new__(cls)
+        for name, array in zip(parameters, arrays):
+            object.__setattr__(probe, name, array)
+
+        shape = arrays[0].shape if arrays else ()
+        mask = np.ones(shape, dtype=bool)
+        failures: dict[str, int] = {}
+        for test, reason in probe.assertions():
+            passed = np.broadcast_to(np.asarray(test, dtype=bool), shape)
+            failures[reason] = failures.get(reason, 0) + int(
+                np.count_nonzero(~passed)
+            )
+            mask &= passed
+        return mask, failures
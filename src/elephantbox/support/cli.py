@@ -1,13 +1,52 @@
 from __future__ import annotations
 
+import shlex
+import sys
 from argparse import ArgumentParser
+from argparse import Namespace
 from collections.abc import Callable
 from collections.abc import Sequence
+from dataclasses import replace
 
 import drawsvg
 
+from elephantbox.analysis.Clearance import check_clearance
+from elephantbox.analysis.Estimate import estimate
+from elephantbox.analysis.Estimate import Machine
+from elephantbox.analysis.Features import check_features
+from elephantbox.analysis.Findings import Finding
+from elephantbox.analysis.Outlines import check_outlines
+from elephantbox.boxes.component.Dash import DashBudgetExceeded
 from elephantbox.boxes.component.Dash import Dasher
+from elephantbox.boxes.component.Defaults import LAYER_KWARGS
+from elephantbox.export.GCode import DEFAULT_LAYER_SETTINGS
+from elephantbox.export.GCode import LayerSettings
+from elephantbox.export.Outputs import Build
+from elephantbox.export.Outputs import save_build
+from elephantbox.export.Outputs import WRITERS
+from elephantbox.export.Png import RasterSettings
+from elephantbox.layout.CommonLines import merge_common_lines
+from elephantbox.layout.Fit import RotationSolver
+from elephantbox.layout.Kerf import compensate_kerf
+from elephantbox.layout.Layers import split_layers
+from elephantbox.layout.Nesting import DEFAULT_ANGLES
+from elephantbox.layout.Nesting import nest
+from elephantbox.layout.Nesting import NestingError
+from elephantbox.layout.Nesting import Part
+from elephantbox.layout.Nesting import split_parts
+from elephantbox.layout.Toolpath import order_contours
+from elephantbox.layout.Toolpath import travel_distance
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Contour import contours_bounds
+from elephantbox.math.Geometry import Bounds
 from elephantbox.math.Geometry import Point
+from elephantbox.support.CompactPath import simplify_paths
+from elephantbox.support.Contours import contours_of
+from elephantbox.support.Contours import draw_contours
+from elephantbox.support.Contours import draw_layers
+from elephantbox.support.Contours import flatten_transforms
+from elephantbox.support.Contours import INKSCAPE_NAMESPACE
+from elephantbox.support.Symbols import share_repeated_paths
 
 
 def debug_args(parser: ArgumentParser):
@@ -35,6 +74,468 @@ def output_args(parser: ArgumentParser):
         "--output-png",
         action="store_true",
     )
+    output_options.add_argument(
+        "--png-dpi",
+        type=float,
+        default=96,
+        metavar="DPI",
+    )
+    output_options.add_argument(
+        "--png-tile",
+        type=int,
+        default=2048,
+        metavar="PIXELS",
+    )
+    output_options.add_argument(
+        "--png-preview",
+        action="store_true",
+    )
+    output_options.add_argument(
+        "--output-dxf",
+        action="store_true",
+    )
+    output_options.add_argument(
+        "--format",
+        action="append",
+        default=[],
+        choices=list(WRITERS),
+    )
+    output_options.add_argument(
+        "--output-threads",
+        type=int,
+        default=1,
+        metavar="COUNT",
+    )
+    output_options.add_argument(
+        "--split-layers",
+        choices=["groups", "files"],
+    )
+    output_options.add_argument(
+        "--expand-symbols",
+        action="store_true",
+    )
+    output_options.add_argument(
+        "--flatten-transforms",
+        action="store_true",
+    )
+    output_options.add_argument(
+        "--fit-view",
+        action="store_true",
+    )
+    output_options.add_argument(
+        "--view-margin",
+        type=float,
+        default=0.25,
+        metavar="LENGTH",
+    )
+
+
+def gcode_args(parser: ArgumentParser):
+    gcode_options = parser.add_argument_group("G-code")
+
+    gcode_options.add_argument(
+        "--output-gcode",
+        action="store_true",
+    )
+    gcode_options.add_argument(
+        "--gcode-layer",
+        nargs=3,
+        action="append",
+        default=[],
+        metavar=("LAYER", "FEED", "POWER"),
+    )
+    gcode_options.add_argument(
+        "--gcode-passes",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("LAYER", "COUNT"),
+    )
+
+
+def machine_args(parser: ArgumentParser):
+    machine_options = parser.add_argument_group("Machine")
+
+    machine_options.add_argument(
+        "--estimate",
+        action="store_true",
+    )
+    machine_options.add_argument(
+        "--acceleration",
+        type=float,
+        default=Machine.acceleration,
+        metavar="MM_PER_S2",
+    )
+    machine_options.add_argument(
+        "--rapid-feed",
+        type=float,
+        default=Machine.rapid_feed,
+        metavar="MM_PER_MIN",
+    )
+    machine_options.add_argument(
+        "--pierce-time",
+        type=float,
+        default=Machine.pierce_time,
+        metavar="SECONDS",
+    )
+    machine_options.add_argument(
+        "--junction-deviation",
+        type=float,
+        default=Machine.junction_deviation,
+        metavar="MM",
+    )
+
+
+def layer_settings(
+    parser: ArgumentParser, args: Namespace
+) -> dict[str, LayerSettings]:
+    settings = dict(DEFAULT_LAYER_SETTINGS)
+    for layer, *_ in args.gcode_layer + args.gcode_passes:
+        if layer not in LAYER_KWARGS:
+            parser.error(
+                f"unknown layer {layer}, expected one of"
+                f" {', '.join(LAYER_KWARGS)}"
+            )
+    for layer, feed, power in args.gcode_layer:
+        settings[layer] = replace(
+            settings[layer], feed=float(feed), power=float(power)
+        )
+    for layer, count in args.gcode_passes:
+        settings[layer] = replace(settings[layer], passes=int(count))
+    return settings
+
+
+def path_args(parser: ArgumentParser):
+    path_options = parser.add_argument_group("Path Options")
+
+    path_options.add_argument(
+        "--simplify",
+        type=float,
+        default=0,
+        metavar="LENGTH",
+    )
+    path_options.add_argument(
+        "--kerf",
+        type=float,
+        default=0,
+        metavar="LENGTH",
+    )
+    path_options.add_argument(
+        "--common-lines",
+        type=float,
+        default=0,
+        metavar="LENGTH",
+    )
+    path_options.add_argument(
+        "--order-toolpath",
+        action="store_true",
+    )
+
+
+def check_args(parser: ArgumentParser):
+    check_options = parser.add_argument_group("Checks")
+
+    check_options.add_argument(
+        "--check-geometry",
+        action="store_true",
+    )
+    check_options.add_argument(
+        "--min-web",
+        type=float,
+        default=0,
+        metavar="LENGTH",
+    )
+
+
+def geometry_findings(
+    contours: list[Contour], args: Namespace, dasher: Dasher
+) -> list[Finding]:
+    findings = []
+    if args.check_geometry:
+        findings.extend(check_outlines(contours, tolerance=0.01))
+    if args.min_web:
+        findings.extend(check_clearance(contours, args.min_web * dasher.dpi))
+    if dasher.min_feature and not dasher.fix_features:
+        findings.extend(
+            check_features(contours, dasher.min_feature, tolerance=0.01)
+        )
+    return findings
+
+
+def unfixed_features(contours: list[Contour], dasher: Dasher) -> list[Finding]:
+    """Features --fix-features could not widen, to warn about, not fail on.
+
+    A span keeps at least one gap, so the shortest rails stay narrow.
+    """
+    if not dasher.fix_features:
+        return []
+    return check_features(contours, dasher.min_feature, tolerance=0.01)
+
+
+def preflight_findings(box) -> list[Finding]:
+    """Every assertion a box and its parts fail, found before any drawing."""
+    return [
+        Finding("validation", f"{type(part).__name__} fails {reason!r}")
+        for part, reason in box.failures()
+    ]
+
+
+def report_findings(
+    findings: list[Finding], dpi: float, prefix: str = ""
+) -> bool:
+    for finding in findings:
+        print(f"{prefix}{finding.describe(dpi)}", file=sys.stderr)
+    return bool(findings)
+
+
+def nest_args(parser: ArgumentParser):
+    nest_options = parser.add_argument_group("Nesting")
+
+    nest_options.add_argument(
+        "--copies",
+        type=int,
+        default=1,
+        metavar="COUNT",
+    )
+    nest_options.add_argument(
+        "--nest-spacing",
+        type=float,
+        default=0.1,
+        metavar="LENGTH",
+    )
+    nest_options.add_argument(
+        "--nest-angle",
+        type=float,
+        action="append",
+        metavar="ANGLE",
+    )
+
+
+def box_args(parser: ArgumentParser, boxType):
+    debug_args(parser)
+    parser.add_argument(
+        "--whole-rotate",
+        type=float,
+        default=0,
+        metavar="ANGLE",
+    )
+    parser.add_argument("--draw-laser-bed", action="store_true")
+    shape_args(parser, boxType)
+    path_args(parser)
+
+
+def shape_args(parser: ArgumentParser, boxType):
+    """Only what builds the box itself: its dimensions, features and dashes."""
+    boxType.add_arguments(parser)
+    Dasher.add_arguments(parser)
+
+
+def build_box(boxType, args: Namespace, dpi: float):
+    d = Dasher.from_args(
+        dimension_scale=dpi,
+        parsed_arguments=args,
+    )
+
+    return boxType.from_args(
+        origin=Point(0, 0),
+        dimension_scale=dpi,
+        dasher=d,
+        parsed_arguments=args,
+    )
+
+
+def bed_drawing(
+    px_origin: Point, px_laser_bed: Point, draw_laser_bed: bool
+) -> drawsvg.Drawing:
+    drawing = drawsvg.Drawing(
+        width="100%",
+        height="100%",
+        viewBox=f"{px_origin.x} {px_origin.y} {px_laser_bed.x} {px_laser_bed.y}",
+    )
+
+    if draw_laser_bed:
+        drawing.append(bed_rectangle(px_origin, px_laser_bed))
+
+    return drawing
+
+
+def bed_rectangle(px_origin: Point, px_laser_bed: Point) -> drawsvg.Rectangle:
+    return drawsvg.Rectangle(
+        *px_origin.tuple,
+        *px_laser_bed.tuple,
+        stroke="orange",
+        stroke_width=3,
+        fill="orange",
+        opacity="25%",
+    )
+
+
+def ordered_toolpath(
+    contours: list[Contour], start: Point, dpi: float, label: str = ""
+) -> list[Contour]:
+    ordered = order_contours(contours, start)
+    print(
+        f"Toolpath travel{f' ({label})' if label else ''}:"
+        f" {travel_distance(contours, start) / dpi:.3f}"
+        f" -> {travel_distance(ordered, start) / dpi:.3f}"
+    )
+    return ordered
+
+
+def finish_paths(grp: drawsvg.Group, args: Namespace, dpi: float):
+    if args.simplify:
+        removed = simplify_paths(grp, args.simplify * dpi)
+        print(f"Simplified paths: {removed} commands removed")
+    if not args.expand_symbols:
+        share_repeated_paths(grp)
+
+
+def output_formats(args: Namespace) -> list[str]:
+    formats = ["svg", *args.format]
+    if args.output_gcode:
+        formats.append("gcode")
+    if args.output_dxf:
+        formats.append("dxf")
+    if args.output_png or args.png_preview:
+        formats.append("png")
+    return formats
+
+
+def raster_settings(args: Namespace) -> RasterSettings:
+    return RasterSettings(
+        dpi=args.png_dpi,
+        tile_size=args.png_tile,
+        threads=args.output_threads,
+        preview=args.png_preview,
+    )
+
+
+def save_bed(
+    name: str,
+    new_drawing: Callable[[], drawsvg.Drawing],
+    grp: drawsvg.Group,
+    contours: list[Contour],
+    bed: Bounds,
+    args: Namespace,
+    dpi: float,
+    settings: dict[str, LayerSettings],
+):
+    """Order, finish and write every requested output for one bed.
+
+    With --split-layers each layer is deduplicated and ordered on its own,
+    then written as named layer groups or as a file set per layer; `grp` is
+    only drawn as it is when neither ordering nor splitting is asked for.
+    """
+    start = bed.origin
+    if args.kerf:
+        contours = compensate_kerf(contours, args.kerf * dpi)
+        grp = draw_contours(contours)
+    if args.common_lines:
+        contours, removed = merge_common_lines(
+            contours, args.common_lines * dpi
+        )
+        print(f"Common lines: {removed / dpi:.3f} of cut length removed")
+        grp = draw_contours(contours)
+
+    def save(name: str, groups: list, contours: list[Contour], **svg_args):
+        drawing = new_drawing()
+        drawing.svg_args.update(svg_args)
+        for g in groups:
+            if args.flatten_transforms:
+                g = flatten_transforms(g)
+            finish_paths(g, args, dpi)
+            drawing.append(g)
+        build = Build(
+            name,
+            drawing,
+            contours,
+            bed,
+            dpi,
+            settings,
+            raster_settings(args),
+        )
+        save_build(build, output_formats(args), args.output_threads)
+        if args.estimate:
+            machine = Machine(
+                args.acceleration,
+                args.rapid_feed,
+                args.pierce_time,
+                args.junction_deviation,
+            )
+            job = estimate(contours, settings, machine, 25.4 / dpi, bed.origin)
+            print(f"Estimate for {name}:\n{job.report()}")
+
+    if not args.split_layers:
+        if args.order_toolpath:
+            contours = ordered_toolpath(contours, start, dpi)
+            grp = draw_contours(contours)
+        save(name, [grp], contours)
+        return
+
+    layers = split_layers(contours)
+    duplicates = len(contours) - sum(len(m) for m in layers.values())
+    if duplicates:
+        print(f"Removed {duplicates} duplicate contours")
+    for layer, members in layers.items():
+        layers[layer] = ordered_toolpath(members, start, dpi, layer)
+        start = layers[layer][-1].end
+
+    if "files" == args.split_layers:
+        for layer, members in layers.items():
+            save(f"{name}-{layer}", [draw_contours(members)], members)
+    else:
+        save(
+            name,
+            draw_layers(layers),
+            [c for members in layers.values() for c in members],
+            **{"xmlns:inkscape": INKSCAPE_NAMESPACE},
+        )
+
+
+def save_nested(
+    parts: list[Part],
+    args: Namespace,
+    laser_bed: Point,
+    dpi: float,
+    settings: dict[str, LayerSettings] = DEFAULT_LAYER_SETTINGS,
+) -> int:
+    px_laser_bed = laser_bed * dpi
+    try:
+        placements = nest(
+            parts,
+            px_laser_bed,
+            spacing=args.nest_spacing * dpi,
+            angles=args.nest_angle or DEFAULT_ANGLES,
+        )
+    except NestingError as e:
+        print(f"Nesting failed: {e}", file=sys.stderr)
+        return 1
+
+    bed_count = 1 + max(p.bed for p in placements)
+    for bed in range(bed_count):
+        grp = drawsvg.Group()
+        on_bed = [p for p in placements if bed == p.bed]
+        for placement in on_bed:
+            grp.append(
+                draw_contours(
+                    list(placement.part.contours),
+                    transform=placement.svg_transform,
+                )
+            )
+        name = args.output if 1 == bed_count else f"{args.output}-{bed + 1}"
+        save_bed(
+            name,
+            lambda: bed_drawing(Point(0, 0), px_laser_bed, args.draw_laser_bed),
+            grp,
+            [c for p in on_bed for c in p.contours],
+            Bounds(0, 0, *px_laser_bed.tuple),
+            args,
+            dpi,
+            settings,
+        )
+
+    print(f"Nested {len(placements)} parts onto {bed_count} beds")
+    return 0
 
 
 def main_maker(
@@ -48,60 +549,196 @@ def main_maker(
 
         parser = argparse.ArgumentParser()
 
-        debug_args(parser)
-        parser.add_argument(
-            "--whole-rotate",
-            type=float,
-            default=0,
-            metavar="ANGLE",
-        )
-        parser.add_argument("--draw-laser-bed", action="store_true")
-        boxType.add_arguments(parser)
-        Dasher.add_arguments(parser)
+        box_args(parser, boxType)
+        parser.add_argument("--auto-rotate", action="store_true")
+        parser.add_argument("--nest", action="store_true")
+        nest_args(parser)
         output_args(parser)
+        gcode_args(parser)
+        machine_args(parser)
+        check_args(parser)
 
         args = parser.parse_args(argv)
+        settings = layer_settings(parser, args)
 
         # # # # # # # # # # # # # # # # # # # # # # # # # #
 
-        d = Dasher.from_args(
-            dimension_scale=dpi,
-            parsed_arguments=args,
-        )
+        the_box = build_box(boxType, args, dpi)
+        d = the_box.dasher
+        if report_findings(preflight_findings(the_box), dpi):
+            return 1
 
-        the_box = boxType.from_args(
-            origin=Point(0, 0),
-            dimension_scale=dpi,
-            dasher=d,
-            parsed_arguments=args,
-        )
+        if args.nest:
+            try:
+                contours = the_box.contours()
+            except DashBudgetExceeded as e:
+                print(f"Dash budget exceeded: {e}", file=sys.stderr)
+                return 1
+            if report_findings(geometry_findings(contours, args, d), dpi):
+                return 1
+            report_findings(unfixed_features(contours, d), dpi, "warning: ")
+            parts = split_parts(contours, boxType.__name__)
+            return save_nested(
+                parts * args.copies, args, laser_bed, dpi, settings
+            )
+
+        try:
+            box_grp = the_box.draw(enable_guides=args.debug)
+        except DashBudgetExceeded as e:
+            print(f"Dash budget exceeded: {e}", file=sys.stderr)
+            return 1
+        if d.ledger.coarsened_spans:
+            print(f"Coarsened dashes: {d.ledger.report()}", file=sys.stderr)
+        if d.ledger.widened_spans:
+            print(
+                f"Widened dashes: {d.ledger.widened_spans} spans",
+                file=sys.stderr,
+            )
 
         px_origin = origin * dpi
         px_laser_bed = laser_bed * dpi
+        bed = Bounds(*px_origin.tuple, *(px_origin + px_laser_bed).tuple)
 
-        drawing = drawsvg.Drawing(
-            width="100%",
-            height="100%",
-            viewBox=f"{px_origin.x} {px_origin.y} {px_laser_bed.x} {px_laser_bed.y}",
-        )
+        if args.auto_rotate:
+            fit = RotationSolver(the_box.measured_contours()).fit(px_laser_bed)
+            print(f"Auto rotate: {fit.report}")
+            shift = bed.center - fit.bounds.center
+            grp = drawsvg.Group(
+                transform=f"translate({shift.x} {shift.y}) rotate({fit.angle})"
+            )
+        else:
+            grp = drawsvg.Group(transform=f"rotate({args.whole_rotate})")
+        grp.append(box_grp)
 
-        if args.draw_laser_bed:
-            drawing.append(
-                drawsvg.Rectangle(
-                    *px_origin.tuple,
-                    *px_laser_bed.tuple,
-                    stroke="orange",
-                    stroke_width=3,
-                    fill="orange",
-                    opacity="25%",
-                )
+        contours = contours_of(grp)
+        if report_findings(geometry_findings(contours, args, d), dpi):
+            return 1
+        report_findings(unfixed_features(contours, d), dpi, "warning: ")
+        extent = contours_bounds(contours)
+        if extent is not None and not bed.contains(extent):
+            print(
+                f"Box extends past the {laser_bed.x:g} x {laser_bed.y:g}"
+                " laser bed",
+                file=sys.stderr,
             )
+        if args.fit_view and extent is not None:
+            view = extent.expanded(args.view_margin * dpi)
+            px_origin, px_laser_bed = view.origin, view.size
 
-        grp = drawsvg.Group(transform=f"rotate({args.whole_rotate})")
+        def new_drawing() -> drawsvg.Drawing:
+            drawing = bed_drawing(px_origin, px_laser_bed, False)
+            if args.draw_laser_bed:
+                drawing.append(bed_rectangle(bed.origin, bed.size))
+            return drawing
 
-        grp.append(the_box.draw(enable_guides=args.debug))
-        drawing.append(grp)
-        drawing.save_svg(f"{args.output}.svg")
+        save_bed(
+            args.output, new_drawing, grp, contours, bed, args, dpi, settings
+        )
         return 0
 
     return main
+
+
+def read_jobs(path: str) -> list[tuple[int, list[str]]]:
+    """Command lines from a job file, one box per line.
+
+    Lines look like the shell commands in prototyping.sh, without `-o`;
+    `#` starts a comment and a trailing backslash continues a line.
+    """
+    jobs = []
+    with open(path) as f:
+        text = f.read().replace("\\\n", " ")
+    for number, line in enumerate(text.splitlines(), start=1):
+        tokens = shlex.split(line, comments=True)
+        if tokens:
+            jobs.append((number, tokens))
+    return jobs
+
+
+def batch_maker(
+    box_types: dict[str, type],
+    laser_bed: Point = Point(12, 12),
+    dpi=96,
+) -> Callable:
+    def main(argv: Sequence[str] | None = None) -> int:
+        import argparse
+
+        parser = argparse.ArgumentParser()
+        parser.add_argument("jobs", metavar="JOBFILE")
+        parser.add_argument("--draw-laser-bed", action="store_true")
+        path_args(parser)
+        nest_args(parser)
+        output_args(parser)
+        gcode_args(parser)
+        machine_args(parser)
+        check_args(parser)
+
+        args = parser.parse_args(argv)
+        settings = layer_settings(parser, args)
+
+        # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+        # every job is validated before any is drawn; failed jobs are
+        # skipped, and their findings reported together at the end
+        jobs = read_jobs(args.jobs)
+        boxes = []
+        rejected: list[tuple[int, Finding]] = []
+        for number, (command, *job_argv) in jobs:
+            if command not in box_types:
+                rejected.append(
+                    (number, Finding("job", f"unknown box {command}"))
+                )
+                continue
+            boxType = box_types[command]
+            # layout and path options belong to the whole batch, so a job
+            # line naming one is rejected rather than silently overridden
+            job_parser = argparse.ArgumentParser(prog=command)
+            debug_args(job_parser)
+            shape_args(job_parser, boxType)
+            try:
+                job_args = job_parser.parse_args(job_argv)
+            except SystemExit:
+                rejected.append((number, Finding("job", "unusable arguments")))
+                continue
+
+            the_box = build_box(boxType, job_args, dpi)
+            findings = preflight_findings(the_box)
+            if findings:
+                rejected.extend((number, finding) for finding in findings)
+                continue
+            boxes.append((number, command, the_box))
+
+        parts = []
+        for number, command, the_box in boxes:
+            try:
+                contours = the_box.contours()
+            except DashBudgetExceeded as e:
+                rejected.append(
+                    (number, Finding("dashes", f"budget exceeded: {e}"))
+                )
+                continue
+            findings = geometry_findings(contours, args, the_box.dasher)
+            if findings:
+                rejected.extend((number, finding) for finding in findings)
+                continue
+            report_findings(
+                unfixed_features(contours, the_box.dasher),
+                dpi,
+                f"{args.jobs}:{number}: warning: ",
+            )
+            parts.extend(split_parts(contours, f"{command}:{number}"))
+
+        status = 0
+        if parts:
+            status = save_nested(
+                parts * args.copies, args, laser_bed, dpi, settings
+            )
+        for number, finding in sorted(rejected, key=lambda r: r[0]):
+            report_findings([finding], dpi, f"{args.jobs}:{number}: ")
+        if rejected:
+            skipped = len(dict.fromkeys(number for number, _ in rejected))
+            print(f"Skipped {skipped} of {len(jobs)} jobs", file=sys.stderr)
+            return 1
+        return status
+
+    return main
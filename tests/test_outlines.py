@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from elephantbox.analysis.Outlines import check_outlines
+from elephantbox.math.Contour import Contour
+from elephantbox.math.Geometry import Point
+from elephantbox.math.Geometry import Segment
+
+
+def loop(*corners: tuple[float, float]) -> Contour:
+    points = [Point(*c) for c in corners]
+    return Contour(
+        tuple(Segment(a, b) for a, b in zip(points, points[1:] + points[:1])),
+        closed=True,
+        layer="body_cut",
+    )
+
+
+def test_rectilinear_self_crossing_is_found():
+    # two edges leave (5, 7), and the loop crosses itself at (8, 7)
+    outline = loop(
+        (5, 7), (10, 7), (10, 3), (8, 3), (8, 10), (0, 10), (0, 0), (5, 0)
+    )
+    findings = check_outlines([outline])
+    assert ["intersection"] == [f.check for f in findings]
+    assert Point(8, 7) == findings[0].location
+
+
+def test_clean_loop_has_no_findings():
+    assert [] == check_outlines([loop((0, 0), (10, 0), (10, 5), (0, 5))])